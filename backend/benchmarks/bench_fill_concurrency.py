@@ -0,0 +1,109 @@
+"""Throughput of the fill-form pipeline at different concurrency levels.
+
+Compares the old per-task ThreadPoolExecutor + asyncio.run approach with
+process_form_async. Network calls (LlamaParse, OpenRouter, Google Forms)
+are replaced with asyncio.sleep so only scheduling overhead and local
+DOCX text extraction are measured.
+
+Usage (from backend/):
+    python -m benchmarks.bench_fill_concurrency [--llm-latency 0.2] [--levels 1 10 100]
+"""
+import os
+import io
+import sys
+import time
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["CACHE_DIR"] = ""
+os.environ.pop("OPENROUTER_API_KEY", None)
+os.environ.pop("LLAMA_CLOUD_API_KEY", None)
+
+from docx import Document
+import main
+from services.resume_parser import ResumeParser, get_resume_cache
+from services.google_forms_service import GoogleFormsService
+from services.uploads import store_bytes
+
+SAMPLE_RESULT = {
+    "Full Name": "Jane Roe",
+    "Email": "jane.roe@example.com",
+    "Phone Number": "+1 555 0100",
+}
+
+def make_docx(marker: str, paragraphs: int = 200) -> bytes:
+    doc = Document()
+    for i in range(paragraphs):
+        doc.add_paragraph(f"Line {i}: built and shipped services in Python, Go and TypeScript.")
+    # Unique bytes per task: the resume cache and single-flight key on content, not filename
+    doc.add_paragraph(f"Reference {marker}")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+def install_fakes(llm_latency: float, submit_latency: float):
+    async def no_llama_cloud(self, content, filename):
+        return None
+
+    async def fake_parse_with_ai(self, text):
+        await asyncio.sleep(llm_latency)
+        return dict(SAMPLE_RESULT)
+
+    async def no_form_plan(self, form_url):
+        return None
+
+    async def fake_submit(self, form_url, resume_data, on_progress=None):
+        await asyncio.sleep(submit_latency)
+        return {"success": True}
+
+    ResumeParser._try_llama_cloud = no_llama_cloud
+    ResumeParser._parse_with_ai = fake_parse_with_ai
+    GoogleFormsService.submit_form_response = fake_submit
+    GoogleFormsService.resume_keys_for_form = no_form_plan
+
+async def legacy_process(task_id: str, form_url: str, content: bytes, filename: str):
+    """The pre-executor implementation of process_form_async"""
+    parser = ResumeParser()
+    with ThreadPoolExecutor() as executor:
+        loop = asyncio.get_event_loop()
+        resume_data = await loop.run_in_executor(executor,
+            lambda: asyncio.run(parser.extract_data(content, filename)))
+    await GoogleFormsService().submit_form_response(form_url, resume_data)
+
+async def pooled_process(task_id: str, form_url: str, content: bytes, filename: str):
+    await main.process_form_async(task_id, form_url, store_bytes(content, filename))
+
+async def run_level(process, name: str, concurrency: int, rounds: int) -> float:
+    completed = 0
+    elapsed = 0.0
+    for r in range(rounds):
+        # Every task parses its own resume, so neither cache hits nor coalescing are measured
+        contents = [make_docx(f"{name}-{concurrency}-{r}-{i}") for i in range(concurrency)]
+        get_resume_cache().clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            process(f"task_{r}_{i}", "https://docs.google.com/forms/d/e/x/viewform", content, f"cv_{r}_{i}.docx")
+            for i, content in enumerate(contents)
+        ))
+        elapsed += time.perf_counter() - start
+        completed += concurrency
+    return completed / elapsed
+
+async def main_async(args):
+    install_fakes(args.llm_latency, args.submit_latency)
+
+    print(f"{'concurrency':>11} {'legacy tasks/s':>15} {'pooled tasks/s':>15} {'speedup':>8}")
+    for level in args.levels:
+        legacy = await run_level(legacy_process, "legacy", level, args.rounds)
+        pooled = await run_level(pooled_process, "pooled", level, args.rounds)
+        print(f"{level:>11} {legacy:>15.1f} {pooled:>15.1f} {pooled / legacy:>7.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--submit-latency", type=float, default=0.05)
+    asyncio.run(main_async(parser.parse_args()))
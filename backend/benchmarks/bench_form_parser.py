@@ -0,0 +1,88 @@
+"""Parse time of viewform pages: legacy lazy regex + json.loads vs services.form_schema.
+
+Pages come from --corpus (saved viewform .html files) when given, plus
+generated pages of increasing size with multiple sections and question
+text containing semicolons, which the legacy pattern cuts short.
+
+Usage (from backend/):
+    python -m benchmarks.bench_form_parser [--corpus DIR] [--repeat 50]
+"""
+import os
+import re
+import sys
+import json
+import time
+import glob
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.form_schema import parse_form_page
+
+def legacy_parse(html: str):
+    """The pre-form_schema implementation: regex compiled per call, lazy match up to the first ';'"""
+    pattern = re.compile(r'var\sFB_PUBLIC_LOAD_DATA_\s=\s(.*?);')
+    match = pattern.search(html)
+    if not match:
+        return None
+    form_data = json.loads(match.group(1))
+    entries = []
+    for entry in form_data[1][1]:
+        if entry[3] == 8:
+            continue
+        for sub_entry in entry[4]:
+            entries.append({"id": sub_entry[0], "name": entry[1], "type": entry[3]})
+    return entries
+
+def make_page(sections: int, questions: int, semicolons: bool = False, padding_kb: int = 200) -> str:
+    items = []
+    entry_id = 1000
+    for s in range(sections):
+        if s:
+            items.append([entry_id, f"Section {s}", None, 8, None])
+            entry_id += 1
+        for q in range(questions):
+            title = f"Question {s}.{q}: describe your experience" + ("; include dates" if semicolons and q % 5 == 0 else "")
+            options = [[f"Option {o}", None, None, None, 0] for o in range(4)] if q % 3 == 0 else None
+            items.append([entry_id, title, None, 2 if options else 0, [[entry_id + 1, options, 1 if q % 2 else 0]]])
+            entry_id += 2
+    load_data = [None, ["Form description", items, None, None, None, None, None, None, "Form title"], "/forms", "Form title"]
+    padding = "<script>var _x = '" + ("a" * 1024) + "';</script>\n"
+    return (
+        "<!DOCTYPE html><html><head>" + padding * (padding_kb // 2)
+        + "<script type=\"text/javascript\" nonce=\"n\">var FB_PUBLIC_LOAD_DATA_ = "
+        + json.dumps(load_data) + ";</script>" + padding * (padding_kb // 2) + "</head><body></body></html>"
+    )
+
+def time_parse(parse, html: str, repeat: int):
+    try:
+        result = parse(html)
+    except ValueError:
+        return None, None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(html)
+    return (time.perf_counter() - start) / repeat * 1000, len(result or [])
+
+def main(args):
+    pages = [(os.path.basename(path), open(path, encoding="utf-8").read())
+             for path in sorted(glob.glob(os.path.join(args.corpus, "*.html")))] if args.corpus else []
+    pages += [
+        ("gen-small", make_page(1, 10)),
+        ("gen-multi-section", make_page(10, 30)),
+        ("gen-large", make_page(40, 50, padding_kb=600)),
+        ("gen-semicolons", make_page(5, 20, semicolons=True)),
+    ]
+
+    print(f"{'page':>20} {'size KB':>8} {'legacy ms':>10} {'entries':>8} {'new ms':>8} {'entries':>8}")
+    for name, html in pages:
+        legacy_ms, legacy_count = time_parse(legacy_parse, html, args.repeat)
+        new_ms, new_count = time_parse(parse_form_page, html, args.repeat)
+        legacy = f"{legacy_ms:>10.3f} {legacy_count:>8}" if legacy_ms is not None else f"{'failed':>10} {'-':>8}"
+        print(f"{name:>20} {len(html) / 1024:>8.0f} {legacy} {new_ms:>8.3f} {new_count:>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of saved viewform .html pages")
+    parser.add_argument("--repeat", type=int, default=50)
+    main(parser.parse_args())
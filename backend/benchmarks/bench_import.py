@@ -0,0 +1,73 @@
+"""Cold-start import report for the API (or any module).
+
+Imports the module in fresh interpreters with -X importtime and reports the
+median wall time, the slowest direct imports, and which heavy dependencies
+ended up loaded at import time (they should all load lazily).
+
+Usage (from backend/):
+    python -m benchmarks.bench_import [--module main] [--runs 5] [--top 15]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("llama_parse", "llama_index", "selenium", "bs4", "PyPDF2", "docx")
+
+def import_once(module: str) -> tuple:
+    """(wall seconds, [(module, cumulative us, depth)] in importtime order) for one cold import"""
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        env={**os.environ, "LOG_FILE": ""}
+    )
+    wall = time.perf_counter() - started
+    modules = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), int(cumulative), depth))
+    return wall, modules
+
+def direct_imports(modules: list, target: str) -> list:
+    """(cumulative us, name) of the modules `target` itself imported; importtime lists children first"""
+    index = max(i for i, (name, _, _) in enumerate(modules) if name == target)
+    target_depth = modules[index][2]
+    children = []
+    for name, cumulative, depth in reversed(modules[:index]):
+        if depth <= target_depth:
+            break
+        if depth == target_depth + 1:
+            children.append((cumulative, name))
+    return sorted(children, reverse=True)
+
+def main(args):
+    walls = []
+    modules = []
+    for _ in range(args.runs):
+        wall, modules = import_once(args.module)
+        walls.append(wall)
+
+    total_us = next(cumulative for name, cumulative, _ in reversed(modules) if name == args.module)
+    direct = direct_imports(modules, args.module)
+    print(f"import {args.module}: median wall {statistics.median(walls) * 1000:.0f} ms over {args.runs} runs, "
+          f"importtime {total_us / 1000:.0f} ms")
+    print(f"{'direct import':<45} {'cumulative ms':>14}")
+    for cumulative, name in direct[:args.top]:
+        print(f"{name:<45} {cumulative / 1000:>14.1f}")
+    imported = {name.split(".")[0] for name, _, _ in modules}
+    loaded = [name for name in HEAVY_MODULES if name in imported]
+    print(f"heavy modules loaded at import: {', '.join(loaded) if loaded else 'none'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    main(parser.parse_args())
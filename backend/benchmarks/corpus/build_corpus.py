@@ -0,0 +1,207 @@
+"""Regenerate the benchmark corpus: viewform snapshots and sample resumes.
+
+The form pages mirror the structure of live viewform pages (question
+containers with the Qr7Oae / M7eMe classes, and the FB_PUBLIC_LOAD_DATA_
+script the Google Forms service reads) with padding scripts to bring
+them to realistic sizes. Resumes are written as TXT, DOCX and PDF; the
+PDFs are built by hand so no extra dependency is needed.
+
+Usage (from backend/):
+    python -m benchmarks.corpus.build_corpus
+"""
+import os
+import sys
+import json
+import html
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from docx import Document
+
+CORPUS_DIR = os.path.dirname(os.path.abspath(__file__))
+FORMS_DIR = os.path.join(CORPUS_DIR, "forms")
+RESUMES_DIR = os.path.join(CORPUS_DIR, "resumes")
+
+# (form id, title, sections of [(question, type code, options)])
+FORMS = [
+    ("contact", "Candidate contact details", [[
+        ("Full name", 0, None),
+        ("Email address", 0, None),
+        ("Phone number", 0, None),
+        ("LinkedIn profile", 0, None),
+    ]]),
+    ("job_application", "Software Engineer application", [
+        [
+            ("Full name", 0, None),
+            ("Email", 0, None),
+            ("Mobile number", 0, None),
+            ("Current location", 0, None),
+        ],
+        [
+            ("Work experience", 1, None),
+            ("Highest qualification", 0, None),
+            ("Technical skills", 1, None),
+            ("Years of experience", 2, ["0-2", "3-5", "6-10", "10+"]),
+        ],
+        [
+            ("Why do you want to join us? Tell us about motivation; culture; growth", 1, None),
+            ("Notice period", 2, ["Immediate", "1 month", "2 months", "3 months"]),
+            ("Expected salary", 0, None),
+        ],
+    ]),
+    ("survey_multi_section", "Engineering hiring survey", [
+        [(f"Section {s} question {q}: rate the process; explain", 1 if q % 3 == 0 else 2,
+          None if q % 3 == 0 else ["Poor", "Fair", "Good", "Excellent"])
+         for q in range(12)]
+        for s in range(8)
+    ]),
+]
+
+RESUME_TEXT = """Jane Roe
+jane.roe@example.com | +44 20 7946 0958 | linkedin.com/in/janeroe | https://github.com/janeroe
+Location: London, UK
+Summary
+Backend engineer with eight years of experience building distributed systems in Python and Go.
+Experience
+Senior Software Engineer, Acme Corp (2019 - 2024): led the migration of the billing platform to Kubernetes, cutting infrastructure cost by 30%.
+Software Engineer, Beta Inc (2016 - 2019): built streaming data pipelines processing 2 TB per day.
+Education
+BSc Computer Science, State University, 2016
+Skills
+Python, Go, PostgreSQL, Kafka, Kubernetes, AWS, Terraform
+Certifications
+AWS Certified Solutions Architect
+"""
+
+# No section headings, so education, experience and skills have to come from the LLM
+SPARSE_RESUME_TEXT = """Alex Kim
+alex.kim@example.org
+I have spent six years as a data engineer at Gamma Analytics, where I own the ingestion platform.
+Before that I studied mathematics at City College and taught myself Scala and Spark.
+"""
+
+PROJECT_PARAGRAPH = (
+    "Designed and operated a multi-region service handling 40k requests per second, "
+    "introduced contract testing across twelve teams, and mentored five engineers. "
+)
+
+def page_padding(kb: int) -> str:
+    return "<script nonce=\"n\">window._c = '" + "x" * (kb * 1024) + "';</script>\n"
+
+def build_form(form_id: str, title: str, sections: list) -> str:
+    items = []
+    question_html = []
+    entry_id = 100000
+    for index, questions in enumerate(sections):
+        if index:
+            items.append([entry_id, f"Part {index + 1}", None, 8, None])
+            entry_id += 1
+        for question, type_code, options in questions:
+            option_list = [[option, None, None, None, 0] for option in options] if options else None
+            items.append([entry_id, question, None, type_code, [[entry_id + 1, option_list, 1]]])
+            if type_code == 1:
+                control = "<textarea class=\"KHxj8b\"></textarea>"
+            elif options:
+                control = "".join(f"<label><input type=\"radio\" value=\"{html.escape(o)}\">{html.escape(o)}</label>" for o in options)
+            else:
+                input_type = "email" if "email" in question.lower() else "text"
+                control = f"<input type=\"{input_type}\" class=\"whsOnd\">"
+            question_html.append(
+                f"<div class=\"Qr7Oae\" role=\"listitem\"><div class=\"M7eMe\">{html.escape(question)}</div>"
+                f"<span class=\"vnumgf\" aria-label=\"Required question\">*</span>{control}</div>"
+            )
+            entry_id += 2
+
+    load_data = [None, [f"{title} description", items, None, None, None, None, None, None, title], "/forms", title]
+    return (
+        "<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(title)}</title>" + page_padding(120)
+        + "<script type=\"text/javascript\" nonce=\"n\">var FB_PUBLIC_LOAD_DATA_ = "
+        + json.dumps(load_data) + ";</script></head><body><form action=\"formResponse\" method=\"POST\">"
+        + "".join(question_html) + "</form>" + page_padding(60) + "</body></html>"
+    )
+
+def build_pdf(pages: list) -> bytes:
+    """Minimal PDF with one Helvetica text stream per page"""
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = len(objects) + 1 + 2 * len(pages)
+    page_ids = []
+    for lines in pages:
+        text = ["BT /F1 10 Tf 50 800 Td 13 TL"]
+        for line in lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            text.append(f"({escaped}) Tj T*")
+        text.append("ET")
+        stream = "\n".join(text).encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font, content)
+        ))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    add(b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids))
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(output)
+
+def wrap(text: str, width: int = 95) -> list:
+    lines = []
+    for paragraph in text.splitlines():
+        while len(paragraph) > width:
+            cut = paragraph.rfind(" ", 0, width)
+            lines.append(paragraph[:cut])
+            paragraph = paragraph[cut + 1:]
+        lines.append(paragraph)
+    return lines
+
+def build_resumes():
+    with open(os.path.join(RESUMES_DIR, "jane_roe.txt"), "w", encoding="utf-8") as f:
+        f.write(RESUME_TEXT)
+    with open(os.path.join(RESUMES_DIR, "alex_kim.txt"), "w", encoding="utf-8") as f:
+        f.write(SPARSE_RESUME_TEXT)
+
+    doc = Document()
+    lines = RESUME_TEXT.strip().splitlines()
+    for line in lines[:3]:
+        doc.add_paragraph(line)
+    table = doc.add_table(rows=0, cols=2)
+    for line in lines[3:]:
+        cells = table.add_row().cells
+        cells[0].text = line
+    doc.save(os.path.join(RESUMES_DIR, "jane_roe.docx"))
+
+    with open(os.path.join(RESUMES_DIR, "jane_roe.pdf"), "wb") as f:
+        f.write(build_pdf([wrap(RESUME_TEXT)]))
+
+    # Ten pages (at least EXTRACT_PARALLEL_MIN_PAGES, so extraction is split across
+    # processes): contact and sections up front, then long project history
+    long_lines = wrap(RESUME_TEXT) + ["Projects"] + wrap(PROJECT_PARAGRAPH * 320)
+    pages = [long_lines[i:i + 58] for i in range(0, len(long_lines), 58)]
+    with open(os.path.join(RESUMES_DIR, "long_cv.pdf"), "wb") as f:
+        f.write(build_pdf(pages))
+
+def main():
+    os.makedirs(FORMS_DIR, exist_ok=True)
+    os.makedirs(RESUMES_DIR, exist_ok=True)
+    for form_id, title, sections in FORMS:
+        with open(os.path.join(FORMS_DIR, f"{form_id}.html"), "w", encoding="utf-8") as f:
+            f.write(build_form(form_id, title, sections))
+    build_resumes()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Local stand-in for Google Forms and OpenRouter used by the benchmarks.
+
+Serves corpus form pages at /forms/d/e/<form id>/viewform, accepts posts
+to /forms/d/e/<form id>/formResponse, and answers OpenRouter-style chat
+completions at /api/v1/chat/completions after a configurable delay with
+JSON shaped like each service's prompt asks for.
+"""
+import os
+import re
+import json
+import time
+import socket
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+FORM_PATH_PATTERN = re.compile(r"^/forms/d/e/([\w-]+)/(viewform|formResponse)")
+TEMPLATE_KEY_PATTERN = re.compile(r'^\s*"([^"]+)":', re.MULTILINE)
+
+
+def fake_completion(prompt: str) -> str:
+    """Plausible model output for the prompts the services send"""
+    if "Resume text:" in prompt:
+        template = prompt.split("Resume text:")[0]
+        return json.dumps({key: f"Sample {key.lower()}" for key in TEMPLATE_KEY_PATTERN.findall(template)})
+    if "Questions:" in prompt:
+        questions = json.loads(prompt.split("Questions:")[1].split("\n\nReturn")[0])
+        return json.dumps({str(question["id"]): None for question in questions})
+    if "mappings" in prompt:
+        return json.dumps({"mappings": {}})
+    return "{}"
+
+
+class StandInServer:
+    """Threaded HTTP server on 127.0.0.1; counts requests per kind"""
+
+    def __init__(self, llm_latency: float = 0.2, submit_latency: float = 0.02, port: int = 0):
+        self.llm_latency = llm_latency
+        self.submit_latency = submit_latency
+        self.counts = {"viewform": 0, "formResponse": 0, "llm": 0}
+        self.forms = {}
+        forms_dir = os.path.join(CORPUS_DIR, "forms")
+        for name in os.listdir(forms_dir):
+            if name.endswith(".html"):
+                with open(os.path.join(forms_dir, name), encoding="utf-8") as f:
+                    self.forms[name[:-5]] = f.read().encode("utf-8")
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Headers and body go out as separate writes; without this Nagle adds ~40 ms
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b"", content_type: str = "text/html; charset=utf-8"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                match = FORM_PATH_PATTERN.match(self.path)
+                if not match or match.group(2) != "viewform" or match.group(1) not in server.forms:
+                    return self._send(404)
+                server.counts["viewform"] += 1
+                self._send(200, server.forms[match.group(1)])
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if self.path.startswith("/api/v1/chat/completions"):
+                    server.counts["llm"] += 1
+                    time.sleep(server.llm_latency)
+                    prompt = json.loads(body)["messages"][0]["content"]
+                    reply = {"choices": [{"message": {"role": "assistant", "content": fake_completion(prompt)}}]}
+                    return self._send(200, json.dumps(reply).encode(), "application/json")
+                match = FORM_PATH_PATTERN.match(self.path)
+                if match and match.group(2) == "formResponse" and match.group(1) in server.forms:
+                    server.counts["formResponse"] += 1
+                    time.sleep(server.submit_latency)
+                    return self._send(200, b"<html>Your response has been recorded.</html>")
+                self._send(404)
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def form_url(self, form_id: str) -> str:
+        return f"{self.base_url}/forms/d/e/{form_id}/viewform"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -1,3 +1,5 @@
+import os
+
 # Free GenAI Models Configuration (Working models only)
 FREE_MODELS = {
     "primary": "mistralai/mistral-7b-instruct:free",
@@ -7,11 +9,171 @@ FREE_MODELS = {
 }
 
 # OpenRouter API Configuration
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1/chat/completions")
 REQUIRED_HEADERS = {
     "HTTP-Referer": "https://localhost:8000",
     "X-Title": "Auto Form Filling Agent"
 }
 
 # Llama Cloud Configuration
-LLAMA_CLOUD_BASE_URL = "https://api.cloud.llamaindex.ai/api/parsing/upload"
\ No newline at end of file
+LLAMA_CLOUD_BASE_URL = "https://api.cloud.llamaindex.ai/api/parsing/upload"
+
+# Cache Configuration
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+# The job queue, task store and queued uploads default to files under CACHE_DIR;
+# they still need a directory when CACHE_DIR is empty (disk cache tier off)
+STATE_DIR = CACHE_DIR or ".cache"
+
+# Parsed resumes are keyed by file hash plus this version; bump it when parsing output changes
+RESUME_PARSER_VERSION = "4"
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "256"))
+RESUME_CACHE_DISK_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_DISK_MAX_ENTRIES", "5000"))
+RESUME_CACHE_TTL = int(os.getenv("RESUME_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Form schemas are reused for FORM_SCHEMA_TTL seconds, then revalidated with
+# ETag/Last-Modified; entries are dropped entirely after FORM_SCHEMA_MAX_AGE
+FORM_SCHEMA_TTL = int(os.getenv("FORM_SCHEMA_TTL", "300"))
+FORM_SCHEMA_MAX_AGE = int(os.getenv("FORM_SCHEMA_MAX_AGE", str(24 * 3600)))
+FORM_SCHEMA_CACHE_MAX_ENTRIES = int(os.getenv("FORM_SCHEMA_CACHE_MAX_ENTRIES", "512"))
+FORM_SCHEMA_CACHE_DISK_MAX_ENTRIES = int(os.getenv("FORM_SCHEMA_CACHE_DISK_MAX_ENTRIES", "5000"))
+
+# Batch submission limits
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+BATCH_HOST_CONCURRENCY = int(os.getenv("BATCH_HOST_CONCURRENCY", "4"))
+
+# Shared outbound HTTP client
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+
+# Worker pool for blocking document parsing (PDF/DOCX text extraction)
+WORKER_POOL_SIZE = int(os.getenv("WORKER_POOL_SIZE", str(min(32, (os.cpu_count() or 1) + 4))))
+
+# Local text extraction stops once EXTRACT_MAX_CHARS characters or EXTRACT_MAX_PAGES
+# pages are collected (0 = no limit). Uncapped reads of PDFs with at least
+# EXTRACT_PARALLEL_MIN_PAGES pages are split across EXTRACT_PROCESSES worker
+# processes on multi-core hosts; capped reads stay serial to stop early
+EXTRACT_PROCESSES = int(os.getenv("EXTRACT_PROCESSES", str(min(4, os.cpu_count() or 1))))
+EXTRACT_PARALLEL_MIN_PAGES = int(os.getenv("EXTRACT_PARALLEL_MIN_PAGES", "8"))
+EXTRACT_MAX_CHARS = int(os.getenv("EXTRACT_MAX_CHARS", "6000"))
+EXTRACT_MAX_PAGES = int(os.getenv("EXTRACT_MAX_PAGES", "0"))
+# Name prefix of the extraction pool's processes
+EXTRACT_PROCESS_NAME = "extract-worker"
+
+# Resume parse order: "local_first" extracts text locally and only sends files whose
+# text layer scores below TEXT_QUALITY_THRESHOLD (0-1) to LlamaParse; "cloud_first"
+# always tries LlamaParse first
+PARSE_MODE = os.getenv("PARSE_MODE", "local_first")
+TEXT_QUALITY_THRESHOLD = float(os.getenv("TEXT_QUALITY_THRESHOLD", "0.6"))
+
+# Form-fill jobs: "inline" runs them as tasks inside the web process; "sqlite" queues
+# them durably in JOB_QUEUE_PATH for separate `python worker.py` processes, each
+# running JOB_WORKER_CONCURRENCY jobs at once. New jobs are refused with 429 once
+# JOB_QUEUE_MAX_DEPTH are queued or running. Transient upstream failures are retried
+# up to JOB_MAX_ATTEMPTS times, backing off exponentially from JOB_RETRY_BASE_DELAY
+# to JOB_RETRY_MAX_DELAY seconds. A running job whose worker stops renewing its
+# lease for JOB_LEASE_SECONDS is picked up again by another worker. Finished jobs
+# are kept for JOB_RETENTION seconds
+JOB_QUEUE = os.getenv("JOB_QUEUE", "inline")
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", os.path.join(STATE_DIR, "jobs.sqlite3"))
+JOB_QUEUE_MAX_DEPTH = int(os.getenv("JOB_QUEUE_MAX_DEPTH", "100"))
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BASE_DELAY = float(os.getenv("JOB_RETRY_BASE_DELAY", "5"))
+JOB_RETRY_MAX_DELAY = float(os.getenv("JOB_RETRY_MAX_DELAY", "300"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+JOB_RETENTION = int(os.getenv("JOB_RETENTION", "86400"))
+
+# Task status storage: "memory" (single process) or "sqlite" (shared by all workers on a host);
+# queued jobs report progress from worker processes, so they need the shared store
+TASK_STORE = os.getenv("TASK_STORE", "sqlite" if JOB_QUEUE == "sqlite" else "memory")
+TASK_STORE_PATH = os.getenv("TASK_STORE_PATH", os.path.join(STATE_DIR, "tasks.sqlite3"))
+TASK_STORE_MAX_TASKS = int(os.getenv("TASK_STORE_MAX_TASKS", "10000"))
+TASK_STORE_TTL = int(os.getenv("TASK_STORE_TTL", "3600"))
+
+# Streaming progress: how often to re-read the task store for updates from other workers
+PROGRESS_POLL_INTERVAL = float(os.getenv("PROGRESS_POLL_INTERVAL", "1.0"))
+
+# Shared headless Chrome pool for the Selenium services
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_POOL_WARM = int(os.getenv("BROWSER_POOL_WARM", "0"))
+BROWSER_MAX_USES = int(os.getenv("BROWSER_MAX_USES", "50"))
+BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "true").lower() == "true"
+BROWSER_CHECKOUT_TIMEOUT = float(os.getenv("BROWSER_CHECKOUT_TIMEOUT", "60"))
+
+# Upper bounds (seconds) for Selenium readiness waits
+READY_PAGE_TIMEOUT = float(os.getenv("READY_PAGE_TIMEOUT", "15"))
+READY_FIELD_TIMEOUT = float(os.getenv("READY_FIELD_TIMEOUT", "5"))
+READY_SUBMIT_TIMEOUT = float(os.getenv("READY_SUBMIT_TIMEOUT", "10"))
+READY_POLL_INTERVAL = float(os.getenv("READY_POLL_INTERVAL", "0.1"))
+NETWORK_IDLE_QUIET = float(os.getenv("NETWORK_IDLE_QUIET", "0.5"))
+
+# Selenium fill mode: "bulk" sets all values in one script call and only types
+# fields that did not take; "keystroke" types every field
+FILL_MODE = os.getenv("FILL_MODE", "bulk")
+
+# Local field matches at or above this confidence skip the LLM
+FIELD_MATCH_THRESHOLD = float(os.getenv("FIELD_MATCH_THRESHOLD", "0.75"))
+# Without the LLM, weaker local matches down to this confidence are still filled
+FIELD_FALLBACK_THRESHOLD = float(os.getenv("FIELD_FALLBACK_THRESHOLD", "0.6"))
+
+# Memo of question label -> resume key decisions, shared across forms and candidates
+FIELD_MAPPING_CACHE_MAX_ENTRIES = int(os.getenv("FIELD_MAPPING_CACHE_MAX_ENTRIES", "4096"))
+FIELD_MAPPING_CACHE_DISK_MAX_ENTRIES = int(os.getenv("FIELD_MAPPING_CACHE_DISK_MAX_ENTRIES", "50000"))
+FIELD_MAPPING_CACHE_TTL = int(os.getenv("FIELD_MAPPING_CACHE_TTL", str(30 * 24 * 3600)))
+# When set, /api/field-mappings/import requires "Authorization: Bearer <token>";
+# imported mappings decide how forms are answered for every candidate
+FIELD_MAPPING_IMPORT_TOKEN = os.getenv("FIELD_MAPPING_IMPORT_TOKEN", "")
+
+# Shared LLM gateway: global concurrency, token bucket sized to the OpenRouter
+# free tier (requests per minute, burst), max seconds a call may queue for a
+# token before failing fast, and seconds before a slow model is hedged with the
+# next one in FREE_MODELS (0 disables hedging)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_RATE_PER_MINUTE = float(os.getenv("LLM_RATE_PER_MINUTE", "20"))
+LLM_RATE_BURST = float(os.getenv("LLM_RATE_BURST", "5"))
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "30"))
+LLM_HEDGE_DELAY = float(os.getenv("LLM_HEDGE_DELAY", "8"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+
+# Resume uploads are streamed to temp files in UPLOAD_TMP_DIR in UPLOAD_CHUNK_SIZE
+# pieces and rejected above UPLOAD_MAX_BYTES. Inline jobs use the system temp dir by
+# default; queued jobs are read by worker processes, so they default to a directory
+# next to the job queue, which must be on storage the API and workers share
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR") or (os.path.join(STATE_DIR, "uploads") if JOB_QUEUE == "sqlite" else None)
+
+# Histogram bucket bounds (seconds) for stage and request timings on /metrics
+METRICS_BUCKETS = tuple(
+    float(bound) for bound in os.getenv(
+        "METRICS_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10,30,60,120"
+    ).split(",")
+)
+
+# Logging: records reach a background writer thread through a queue of at most
+# LOG_QUEUE_SIZE records (extras are dropped). LOG_FILE is empty for stdout only.
+# Several processes log at once (web workers, worker.py), so with LOG_ROTATION
+# "size" each process writes LOG_FILE with its pid inserted (app.1234.log), rotated
+# at LOG_MAX_BYTES keeping LOG_BACKUP_COUNT old files; with "external" they all
+# append to LOG_FILE itself and reopen it after logrotate moves it. Extraction
+# pool processes log to stdout only. Logged payloads are cut to
+# LOG_PAYLOAD_MAX_CHARS, and only LOG_PAYLOAD_SAMPLE_RATE of responses and parsed
+# resumes are rendered in full; the rest log a summary of their keys
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FILE = os.getenv("LOG_FILE", "app.log")
+LOG_ROTATION = os.getenv("LOG_ROTATION", "size")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "1000"))
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.1"))
+
+# Heavy optional dependencies (see services/registry.py) load on first use. List
+# names in WARM_IMPORTS, or "all", to import them in the background once the app
+# is serving, so the first request that needs them does not pay for the import
+WARM_IMPORTS = [name.strip() for name in os.getenv("WARM_IMPORTS", "").split(",") if name.strip()]
@@ -1,30 +1,115 @@
-import logging
+import os
 import sys
-from datetime import datetime
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
+import queue
+import atexit
+import random
+import reprlib
+import logging
+import multiprocessing
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, WatchedFileHandler
+from config import (
+    EXTRACT_PROCESS_NAME,
+    LOG_LEVEL,
+    LOG_FILE,
+    LOG_ROTATION,
+    LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT,
+    LOG_QUEUE_SIZE,
+    LOG_PAYLOAD_MAX_CHARS,
+    LOG_PAYLOAD_SAMPLE_RATE,
 )
 
+
+class DroppingQueueHandler(QueueHandler):
+    """Hands records to the writer thread; drops (and counts) them when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# Bounded repr: cost stays small however large the payload is
+_payload_repr = reprlib.Repr()
+_payload_repr.maxlevel = 3
+_payload_repr.maxdict = 20
+_payload_repr.maxlist = 10
+_payload_repr.maxstring = 200
+_payload_repr.maxother = 200
+
+
+class Payload:
+    """Log argument rendered only if the record is emitted, capped in size and optionally sampled"""
+
+    __slots__ = ("data", "sampled")
+
+    def __init__(self, data, sampled: bool = False):
+        self.data = data
+        self.sampled = sampled
+
+    def __str__(self):
+        if self.sampled and random.random() >= LOG_PAYLOAD_SAMPLE_RATE:
+            if isinstance(self.data, dict):
+                return f"<{len(self.data)} keys: {', '.join(map(str, list(self.data)[:20]))}>"
+            return f"<{type(self.data).__name__}>"
+        text = _payload_repr.repr(self.data)
+        if len(text) > LOG_PAYLOAD_MAX_CHARS:
+            text = f"{text[:LOG_PAYLOAD_MAX_CHARS]}... ({len(text)} chars)"
+        return text
+
+
+def _file_handler():
+    """Handler for LOG_FILE in this process, or None when this process keeps to stdout"""
+    # Extraction pool processes import the app modules but have nothing worth a file
+    if not LOG_FILE or multiprocessing.current_process().name.startswith(EXTRACT_PROCESS_NAME):
+        return None
+    if LOG_ROTATION == "external":
+        # Appends of whole records are safe from many processes; logrotate does the rotating
+        return WatchedFileHandler(LOG_FILE)
+    # Rotating renames the file under other writers, so each process rotates its own
+    root, extension = os.path.splitext(LOG_FILE)
+    return RotatingFileHandler(f"{root}.{os.getpid()}{extension}", maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
+
+
+def _configure_logging():
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [logging.StreamHandler(sys.stdout)]
+    file_handler = _file_handler()
+    if file_handler:
+        handlers.append(file_handler)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # The request path only formats the message and enqueues it; file and stdout writes happen on the listener thread
+    queue_handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(queue_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return queue_handler
+
+
+queue_handler = _configure_logging()
 logger = logging.getLogger(__name__)
 
 def log_request(endpoint: str, data: dict = None):
-    logger.info(f"REQUEST {endpoint}: {data}")
+    logger.info("REQUEST %s: %s", endpoint, Payload(data))
 
 def log_response(endpoint: str, response: dict):
-    logger.info(f"RESPONSE {endpoint}: {response}")
+    logger.info("RESPONSE %s: %s", endpoint, Payload(response, sampled=True))
 
 def log_resume_data(data: dict):
-    logger.info(f"EXTRACTED RESUME DATA: {data}")
+    logger.info("EXTRACTED RESUME DATA: %s", Payload(data, sampled=True))
 
 def log_form_fields(fields: dict):
-    logger.info(f"FORM FIELDS DETECTED: {fields}")
+    logger.info("FORM FIELDS DETECTED: %s", Payload(fields))
 
 def log_error(error: str, context: str = ""):
-    logger.error(f"ERROR {context}: {error}")
\ No newline at end of file
+    logger.error("ERROR %s: %s", context, error)
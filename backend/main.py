@@ -1,19 +1,87 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
 import time
+IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, File, UploadFile, Form, Header, HTTPException, WebSocket, WebSocketDisconnect, Request
+from fastapi.responses import StreamingResponse, Response
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-import httpx
+from typing import List
+from urllib.parse import urlparse
 import os
+import json
+import hmac
+import uuid
 from dotenv import load_dotenv
-from services.resume_parser import ResumeParser
-from services.form_analyzer import FormAnalyzer
-from services.form_filler import FormFiller
-from services.google_forms_service import GoogleFormsService
-from logger import log_request, log_response, log_error
 
+# Load .env before importing modules that read configuration at import time
 load_dotenv()
 
-app = FastAPI(title="Auto Form Filling Agent", version="1.0.0")
+# Selenium, BeautifulSoup, LlamaParse, PyPDF2 and python-docx are not imported here;
+# services.registry loads them (and FormAnalyzer / FormFiller) on first use
+from services.resume_parser import ResumeParser, get_resume_cache, resume_parse_flights
+from services.google_forms_service import GoogleFormsService, get_form_schema_cache, form_fetch_flights
+from services.http_client import get_http_client, close_http_client
+from services.executor import get_executor, shutdown_executor, executor_stats
+from services.task_store import get_task_store
+from services.progress import update_task, watch_task, get_progress_broker
+from services.browser_pool import get_browser_pool, close_browser_pool
+from services.mapping_cache import get_mapping_cache
+from services.llm_gateway import get_llm_gateway
+from services.uploads import StoredUpload, save_upload, UploadTooLarge
+from services.job_queue import get_job_queue, QueueFull
+from services.form_jobs import FILL_FORM, run_fill_job, fill_job_payload
+from services.metrics import (
+    REQUEST_DURATION,
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    collect_spans,
+    spans_ms,
+    render_metrics,
+    render_samples,
+)
+from services.registry import warm, import_report
+from logger import log_request, log_response, log_error, queue_handler as log_queue_handler
+from config import (
+    BATCH_MAX_ITEMS,
+    BATCH_HOST_CONCURRENCY,
+    BROWSER_POOL_WARM,
+    FIELD_MAPPING_IMPORT_TOKEN,
+    JOB_QUEUE_MAX_DEPTH,
+    PROGRESS_POLL_INTERVAL,
+    WARM_IMPORTS,
+)
+
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
+startup = {"import_ms": round(IMPORT_SECONDS * 1000, 1), "lifespan_ms": None}
+
+async def warm_imports():
+    try:
+        await asyncio.to_thread(warm, None if "all" in WARM_IMPORTS else WARM_IMPORTS)
+    except Exception as e:
+        log_error(f"Import warm-up failed: {e}", "startup")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    # Open the pooled HTTP client and worker pool up front, release them on shutdown
+    get_http_client()
+    get_executor()
+    # Opening the job queue creates its SQLite schema, so do it before serving
+    await asyncio.to_thread(get_job_queue)
+    if BROWSER_POOL_WARM:
+        await asyncio.to_thread(get_browser_pool().warm, BROWSER_POOL_WARM)
+    if WARM_IMPORTS:
+        # In the background, so the app starts serving without waiting for the imports
+        app.state.warm_imports = asyncio.create_task(warm_imports())
+    startup["lifespan_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    yield
+    await close_http_client()
+    shutdown_executor()
+    close_browser_pool()
+    get_task_store().flush()
+
+app = FastAPI(title="Auto Form Filling Agent", version="1.0.0", lifespan=lifespan)
 
 # Add CORS configuration for Netlify frontend
 app.add_middleware(
@@ -24,6 +92,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_duration(request: Request, call_next):
+    started = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        # Label by route template so /api/task-status/{task_id} is one series
+        route = request.scope.get("route")
+        REQUEST_DURATION.observe(
+            time.perf_counter() - started, request.method, route.path if route else "unmatched", status
+        )
+
 class FormFillRequest(BaseModel):
     form_url: str
 
@@ -37,12 +120,15 @@ async def parse_resume(file: UploadFile = File(...)):
             raise HTTPException(status_code=400, detail="Unsupported file format")
         
         parser = ResumeParser()
-        content = await file.read()
-        extracted_data = await parser.extract_data(content, file.filename)
+        with await save_upload(file) as upload:
+            extracted_data = await parser.extract_upload(upload)
         
         response = {"status": "success", "data": extracted_data}
         log_response("/api/parse-resume", response)
         return response
+    except UploadTooLarge as e:
+        log_error(str(e), "parse-resume")
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         log_error(str(e), "parse-resume")
         raise HTTPException(status_code=500, detail=str(e))
@@ -63,59 +149,364 @@ async def analyze_form(request: FormFillRequest):
         log_error(str(e), "analyze-form")
         raise HTTPException(status_code=500, detail=str(e))
 
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
+def new_task_id(prefix: str) -> str:
+    # Random suffix keeps IDs unique across worker processes
+    return f"{prefix}_{int(time.time() * 1000)}_{uuid.uuid4().hex[:8]}"
 
-# Global task storage
-processing_tasks = {}
+# Fill tasks running in this process when JOB_QUEUE=inline (referenced so they are not collected)
+inline_jobs = set()
+# Batch tasks running in this process, with their batch state, whatever JOB_QUEUE is.
+# Batch items stay out of the durable queue: they share resumes parsed once per batch
+# and write one batch record, which workers would have to rewrite item by item. They
+# still count toward JOB_QUEUE_MAX_DEPTH, and a batch lost with its process is not retried
+batch_jobs = {}
+
+async def fill_jobs_depth() -> int:
+    """Form fills waiting or running: queued or inline jobs plus unfinished batch items"""
+    queue = get_job_queue()
+    # The queue count blocks on SQLite (and on enqueues waiting for worker write locks)
+    depth = await asyncio.to_thread(queue.depth) if queue else len(inline_jobs)
+    return depth + sum(batch["total"] - batch["completed"] for batch in batch_jobs.values())
 
 @app.post("/api/fill-form")
 async def fill_form(
     form_url: str = Form(...),
     file: UploadFile = File(...)
 ):
-    task_id = f"task_{int(time.time() * 1000)}"
+    task_id = new_task_id("task")
     log_request("/api/fill-form", {"task_id": task_id, "form_url": form_url, "filename": file.filename})
     
+    # Shed load before spending disk and parse time on a job that cannot be taken
+    if await fill_jobs_depth() >= JOB_QUEUE_MAX_DEPTH:
+        raise HTTPException(status_code=429, detail="Too many form fills in progress, retry later",
+                            headers={"Retry-After": "30"})
+    
+    upload = None
     try:
-        content = await file.read()
+        upload = await save_upload(file)
         
-        # Start async processing
-        processing_tasks[task_id] = {"status": "processing", "progress": 0}
-        asyncio.create_task(process_form_async(task_id, form_url, content, file.filename))
+        queue = get_job_queue()
+        if queue:
+            # Worker processes pick the job up; the worker deletes the upload when it finishes
+            update_task(task_id, {"status": "queued", "progress": 0})
+            await asyncio.to_thread(queue.enqueue, task_id, FILL_FORM, fill_job_payload(form_url, upload))
+        else:
+            # Start async processing; the task deletes the upload when it finishes
+            update_task(task_id, {"status": "processing", "progress": 0})
+            task = asyncio.create_task(process_form_async(task_id, form_url, upload))
+            inline_jobs.add(task)
+            task.add_done_callback(inline_jobs.discard)
         
         return {"task_id": task_id, "status": "started", "message": "Processing started"}
+    except QueueFull as e:
+        upload.cleanup()
+        get_task_store().delete(task_id)
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    except UploadTooLarge as e:
+        log_error(str(e), "fill-form")
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
+        if upload:
+            upload.cleanup()
         log_error(str(e), "fill-form")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/task-status/{task_id}")
 async def get_task_status(task_id: str):
-    if task_id not in processing_tasks:
+    task = get_task_store().get(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    return processing_tasks[task_id]
+    return task
 
-async def process_form_async(task_id: str, form_url: str, content: bytes, filename: str):
+@app.get("/api/task-events/{task_id}")
+async def stream_task_events(task_id: str):
+    """Server-sent events stream of task progress, closed once the task finishes"""
+    if get_task_store().get(task_id) is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    async def events():
+        async for state in watch_task(task_id):
+            yield f"event: progress\ndata: {json.dumps(state)}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.websocket("/api/ws/tasks/{task_id}")
+async def task_events_websocket(websocket: WebSocket, task_id: str):
+    await websocket.accept()
+    if get_task_store().get(task_id) is None:
+        await websocket.close(code=4404, reason="Task not found")
+        return
     try:
-        processing_tasks[task_id] = {"status": "processing", "progress": 10, "message": "Parsing resume..."}
-        
-        # Parse resume in thread pool
-        parser = ResumeParser()
-        with ThreadPoolExecutor() as executor:
-            loop = asyncio.get_event_loop()
-            resume_data = await loop.run_in_executor(executor, 
-                lambda: asyncio.run(parser.extract_data(content, filename)))
+        async for state in watch_task(task_id):
+            await websocket.send_json(state)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+async def process_form_async(task_id: str, form_url: str, upload: StoredUpload):
+    """Run a fill job inside the web process (JOB_QUEUE=inline); worker.py runs queued ones"""
+    # Per-stage durations end up in the task state as "timing" (ms)
+    with collect_spans() as spans:
+        try:
+            with upload:
+                result = await run_fill_job(task_id, form_url, upload)
+            
+            update_task(task_id, {"status": "completed", "progress": 100, "result": result, "timing": spans_ms(spans)})
+            
+        except Exception as e:
+            update_task(task_id, {"status": "error", "error": str(e), "timing": spans_ms(spans)})
+
+# Submissions in flight per form host, shared by all batches
+host_semaphores = {}
+
+def get_host_semaphore(form_url: str) -> asyncio.Semaphore:
+    host = urlparse(form_url).netloc
+    if host not in host_semaphores:
+        host_semaphores[host] = asyncio.Semaphore(BATCH_HOST_CONCURRENCY)
+    return host_semaphores[host]
+
+@app.post("/api/fill-forms/batch")
+async def fill_forms_batch(
+    form_urls: List[str] = Form(...),
+    files: List[UploadFile] = File(...)
+):
+    batch_id = new_task_id("batch")
+    log_request("/api/fill-forms/batch", {
+        "batch_id": batch_id,
+        "form_urls": form_urls,
+        "filenames": [file.filename for file in files]
+    })
+    
+    total = len(files) * len(form_urls)
+    if total > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Batch exceeds {BATCH_MAX_ITEMS} submissions")
+    # Batch items count toward the same limit as single fills, so the whole batch must fit
+    if await fill_jobs_depth() + total > JOB_QUEUE_MAX_DEPTH:
+        raise HTTPException(status_code=429, detail="Too many form fills in progress, retry later",
+                            headers={"Retry-After": "30"})
+    for file in files:
+        if not file.filename.endswith(('.pdf', '.docx', '.txt')):
+            raise HTTPException(status_code=400, detail=f"Unsupported file format: {file.filename}")
+    
+    uploads = []
+    try:
+        for file in files:
+            uploads.append(await save_upload(file))
         
-        processing_tasks[task_id] = {"status": "processing", "progress": 60, "message": "Analyzing form..."}
+        items = []
+        for resume_index, upload in enumerate(uploads):
+            for form_url in form_urls:
+                items.append({
+                    "resume_index": resume_index,
+                    "filename": upload.filename,
+                    "form_url": form_url,
+                    "status": "pending"
+                })
+        batch = {"status": "processing", "total": len(items), "completed": 0, "items": items}
+        update_task(batch_id, batch)
+        task = asyncio.create_task(process_batch_async(batch_id, batch, uploads, form_urls))
+        batch_jobs[task] = batch
+        task.add_done_callback(lambda done: batch_jobs.pop(done, None))
         
-        # Submit form
+        return {"batch_id": batch_id, "status": "started", "total": len(items)}
+    except Exception as e:
+        for upload in uploads:
+            upload.cleanup()
+        log_error(str(e), "fill-forms-batch")
+        status_code = 413 if isinstance(e, UploadTooLarge) else 500
+        raise HTTPException(status_code=status_code, detail=str(e))
+
+@app.get("/api/batch-status/{batch_id}")
+async def get_batch_status(batch_id: str):
+    batch = get_task_store().get(batch_id)
+    if batch is None or "items" not in batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
+
+async def process_batch_async(batch_id: str, batch: dict, uploads: list, form_urls: list):
+    try:
         google_forms = GoogleFormsService()
-        result = await google_forms.submit_form_response(form_url, resume_data)
         
-        processing_tasks[task_id] = {"status": "completed", "progress": 100, "result": result}
+        # Parse every resume and warm every form schema exactly once
+        async def parse(upload: StoredUpload):
+            with upload:
+                return await ResumeParser().extract_upload(upload)
+        
+        parsed = await asyncio.gather(
+            *(parse(upload) for upload in uploads),
+            return_exceptions=True
+        )
+        await asyncio.gather(
+            *(google_forms.get_form_entries(url) for url in dict.fromkeys(form_urls)),
+            return_exceptions=True
+        )
+        
+        # Item changes are saved at most once per PROGRESS_POLL_INTERVAL rather than
+        # re-serializing the whole batch on every change
+        changed = False
         
+        async def save_changes():
+            nonlocal changed
+            while True:
+                await asyncio.sleep(PROGRESS_POLL_INTERVAL)
+                if changed:
+                    changed = False
+                    update_task(batch_id, batch)
+        
+        async def submit(item: dict):
+            nonlocal changed
+            resume_data = parsed[item["resume_index"]]
+            try:
+                if isinstance(resume_data, Exception):
+                    raise resume_data
+                async with get_host_semaphore(item["form_url"]):
+                    item["status"] = "processing"
+                    changed = True
+                    result = await GoogleFormsService().submit_form_response(item["form_url"], resume_data)
+                item["status"] = "completed" if result.get("success") else "error"
+                item["result"] = result
+            except Exception as e:
+                item["status"] = "error"
+                item["error"] = str(e)
+            batch["completed"] += 1
+            changed = True
+        
+        saver = asyncio.create_task(save_changes())
+        try:
+            await asyncio.gather(*(submit(item) for item in batch["items"]))
+        finally:
+            saver.cancel()
+        batch["status"] = "completed"
+        update_task(batch_id, batch)
     except Exception as e:
-        processing_tasks[task_id] = {"status": "error", "error": str(e)}
+        # A crash outside the per-item handling would otherwise leave the batch "processing" forever
+        log_error(f"Batch {batch_id} failed: {e}", "fill-forms-batch")
+        for upload in uploads:
+            upload.cleanup()
+        batch["status"] = "error"
+        batch["error"] = str(e)
+        update_task(batch_id, batch)
+
+@app.get("/api/cache-stats")
+async def cache_stats():
+    return {
+        "resumes": get_resume_cache().stats(),
+        "form_schemas": get_form_schema_cache().stats(),
+        "field_mappings": get_mapping_cache().stats(),
+        "coalesced": {
+            "resume_parses": resume_parse_flights.stats(),
+            "form_fetches": form_fetch_flights.stats()
+        }
+    }
+
+def runtime_metrics(job_stats: dict = None) -> list:
+    """Cache, coalescing and queue-depth samples read at scrape time.
+
+    `job_stats` is the durable queue's stats(), read off the event loop by the caller.
+    """
+    caches = {
+        "resumes": get_resume_cache().stats(),
+        "form_schemas": get_form_schema_cache().stats(),
+        "field_mappings": get_mapping_cache().stats(),
+    }
+    flights = {"resume_parses": resume_parse_flights.stats(), "form_fetches": form_fetch_flights.stats()}
+    gateway = get_llm_gateway()
+    llm_models = gateway.stats() if gateway else {}
+    llm_queue = gateway.queue_stats() if gateway else {"waiting": 0, "active": 0}
+    browsers = get_browser_pool().stats()
+    
+    lines = []
+    lines += render_samples("cache_hits_total", "Cache hits by tier", "counter", [
+        ({"cache": name, "tier": tier}, stats[f"{tier}_hits"])
+        for name, stats in caches.items() for tier in ("memory", "disk")
+    ])
+    lines += render_samples("cache_misses_total", "Cache misses", "counter", [
+        ({"cache": name}, stats["misses"]) for name, stats in caches.items()
+    ])
+    lines += render_samples("cache_hit_ratio", "Hits over lookups since start", "gauge", [
+        ({"cache": name}, stats["hit_ratio"]) for name, stats in caches.items()
+    ])
+    lines += render_samples("cache_entries", "Entries held per tier", "gauge", [
+        ({"cache": name, "tier": tier}, stats[f"{tier}_entries"])
+        for name, stats in caches.items() for tier in ("memory", "disk")
+    ])
+    lines += render_samples("cache_evictions_total", "Entries evicted or expired", "counter", [
+        ({"cache": name}, stats["evictions"]) for name, stats in caches.items()
+    ])
+    lines += render_samples("single_flight_calls_total", "Calls that ran versus joined an in-flight call", "counter", [
+        ({"flight": name, "result": result}, stats[result])
+        for name, stats in flights.items() for result in ("executed", "coalesced")
+    ])
+    lines += render_samples("single_flight_in_flight", "Calls currently running", "gauge", [
+        ({"flight": name}, stats["in_flight"]) for name, stats in flights.items()
+    ])
+    lines += render_samples("llm_calls_total", "OpenRouter calls by model", "counter", [
+        ({"model": model}, stats["calls"]) for model, stats in llm_models.items()
+    ])
+    lines += render_samples("llm_errors_total", "Failed OpenRouter calls by model", "counter", [
+        ({"model": model}, stats["errors"]) for model, stats in llm_models.items()
+    ])
+    lines += render_samples("queue_depth", "Work waiting for or holding a bounded resource", "gauge", [
+        ({"queue": "worker_pool", "state": "pending"}, executor_stats()["pending"]),
+        ({"queue": "llm", "state": "waiting"}, llm_queue["waiting"]),
+        ({"queue": "llm", "state": "active"}, llm_queue["active"]),
+        ({"queue": "browser_pool", "state": "waiting"}, browsers["waiting"]),
+        ({"queue": "browser_pool", "state": "active"}, browsers["in_use"]),
+        ({"queue": "progress_streams", "state": "active"}, get_progress_broker().stats()["subscribers"]),
+        ({"queue": "log", "state": "pending"}, log_queue_handler.queue.qsize()),
+    ])
+    if job_stats is not None:
+        lines += render_samples("fill_jobs", "Queued form-fill jobs by status", "gauge", [
+            ({"status": status}, count) for status, count in job_stats.items() if status != "max_depth"
+        ])
+    else:
+        lines += render_samples("fill_jobs", "Form-fill jobs running in this process", "gauge", [
+            ({"status": "running"}, len(inline_jobs))
+        ])
+    lines += render_samples("batch_items_pending", "Unfinished items of batches running in this process", "gauge", [
+        ({}, sum(batch["total"] - batch["completed"] for batch in batch_jobs.values()))
+    ])
+    lines += render_samples("app_import_seconds", "Time to import main.py", "gauge", [({}, IMPORT_SECONDS)])
+    lines += render_samples("lazy_import_seconds", "First-use import time of lazily loaded dependencies", "gauge", [
+        ({"name": name}, ms / 1000) for name, ms in import_report()["loaded_ms"].items()
+    ])
+    lines += render_samples("log_records_dropped_total", "Log records dropped because the log queue was full", "counter", [
+        ({}, log_queue_handler.dropped)
+    ])
+    return lines
+
+@app.get("/metrics")
+async def metrics():
+    job_queue = get_job_queue()
+    job_stats = await asyncio.to_thread(job_queue.stats) if job_queue else None
+    return Response(render_metrics(runtime_metrics(job_stats)), media_type=METRICS_CONTENT_TYPE)
+
+@app.get("/api/startup-stats")
+async def startup_stats():
+    """How long main.py took to import and start, and which lazy dependencies have loaded"""
+    return {**startup, "lazy_imports": import_report()}
+
+@app.get("/api/llm-stats")
+async def llm_stats():
+    gateway = get_llm_gateway()
+    return {"models": gateway.stats() if gateway else {}}
+
+@app.get("/api/field-mappings/export")
+async def export_field_mappings():
+    return get_mapping_cache().export()
+
+@app.post("/api/field-mappings/import")
+async def import_field_mappings(data: dict, authorization: str = Header(None)):
+    if FIELD_MAPPING_IMPORT_TOKEN and not hmac.compare_digest(
+        authorization or "", f"Bearer {FIELD_MAPPING_IMPORT_TOKEN}"
+    ):
+        raise HTTPException(status_code=401, detail="Invalid or missing import token",
+                            headers={"WWW-Authenticate": "Bearer"})
+    try:
+        counts = get_mapping_cache().import_entries(data)
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "success", **counts}
 
 @app.get("/api/hello")
 async def hello_world():
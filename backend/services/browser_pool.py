@@ -0,0 +1,210 @@
+import queue
+import asyncio
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from logger import log_error
+from services.registry import load
+from config import (
+    BROWSER_POOL_SIZE,
+    BROWSER_MAX_USES,
+    BROWSER_HEADLESS,
+    BROWSER_CHECKOUT_TIMEOUT,
+)
+
+
+class BrowserPool:
+    """Bounded pool of warm Chrome drivers shared by FormFiller and FormAnalyzer.
+
+    Drivers are reset (cookies, storage, blank page) and health-checked on
+    every return, and replaced after max_uses checkouts. acquire/release
+    block; async callers use acquire_async/release_async (or driver_async),
+    which wait on a worker thread so the event loop keeps running.
+    """
+
+    def __init__(self, size: int = 2, max_uses: int = 50, headless: bool = True, checkout_timeout: float = 60):
+        self.size = size
+        self.max_uses = max_uses
+        self.headless = headless
+        self.checkout_timeout = checkout_timeout
+        self.created = 0
+        self.recycled = 0
+        self.in_use = 0
+        self.waiting = 0
+
+        # LIFO so the most recently used (warmest) driver is handed out first
+        self._idle = queue.LifoQueue()
+        self._uses = {}
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    def _create_driver(self):
+        # Selenium is only imported once a browser is actually needed
+        webdriver = load("webdriver")
+        options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-plugins")
+        options.add_argument("--disable-images")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+        options.add_experimental_option("prefs", {
+            "profile.default_content_setting_values.notifications": 2
+        })
+        driver = webdriver.Chrome(options=options)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        driver.set_window_size(1920, 1080)
+
+        with self._lock:
+            self.created += 1
+            self._uses[driver] = 0
+        return driver
+
+    def warm(self, count: int = None):
+        """Start drivers ahead of the first checkout"""
+        count = min(self.size if count is None else count, self.size)
+        while self._idle.qsize() < count:
+            self._idle.put(self._create_driver())
+
+    def acquire(self):
+        with self._lock:
+            self.waiting += 1
+        try:
+            acquired = self._slots.acquire(timeout=self.checkout_timeout)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+        if not acquired:
+            raise TimeoutError("No browser available in pool")
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    driver = self._create_driver()
+                    break
+                if self._is_healthy(driver):
+                    break
+                self._discard(driver)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.in_use += 1
+        return driver
+
+    def release(self, driver):
+        try:
+            with self._lock:
+                self._uses[driver] = self._uses.get(driver, 0) + 1
+                uses = self._uses[driver]
+
+            if uses >= self.max_uses or not self._reset(driver):
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            self._slots.release()
+
+    @contextmanager
+    def driver(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    async def acquire_async(self):
+        checkout = asyncio.ensure_future(asyncio.to_thread(self.acquire))
+        try:
+            return await asyncio.shield(checkout)
+        except asyncio.CancelledError:
+            # The thread may still get a driver after the caller gave up; hand it straight back
+            checkout.add_done_callback(self._release_abandoned)
+            raise
+
+    def _release_abandoned(self, checkout):
+        if not checkout.cancelled() and checkout.exception() is None:
+            asyncio.get_running_loop().run_in_executor(None, self.release, checkout.result())
+
+    async def release_async(self, driver):
+        await asyncio.to_thread(self.release, driver)
+
+    @asynccontextmanager
+    async def driver_async(self):
+        driver = await self.acquire_async()
+        try:
+            yield driver
+        finally:
+            await self.release_async(driver)
+
+    def _is_healthy(self, driver) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _reset(self, driver) -> bool:
+        """Clear per-session state so the next checkout starts clean"""
+        try:
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except Exception:
+                pass  # Pages without storage access (about:blank, errors)
+            try:
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            except Exception:
+                driver.delete_all_cookies()
+            driver.get("about:blank")
+            return self._is_healthy(driver)
+        except Exception as e:
+            log_error(f"Browser reset failed: {e}", "browser-pool")
+            return False
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(driver, None)
+            self.recycled += 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "created": self.created,
+            "recycled": self.recycled,
+        }
+
+
+_browser_pool = None
+
+def get_browser_pool() -> BrowserPool:
+    """Shared browser pool, created on first use"""
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool(BROWSER_POOL_SIZE, BROWSER_MAX_USES, BROWSER_HEADLESS, BROWSER_CHECKOUT_TIMEOUT)
+    return _browser_pool
+
+def close_browser_pool():
+    global _browser_pool
+    if _browser_pool is not None:
+        _browser_pool.close()
+        _browser_pool = None
@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from logger import log_error
+from config import CACHE_DIR
+
+# Disk tiers drop expired and over-limit rows at most this often, not on every write
+EVICT_INTERVAL = 60
+
+
+class MemoryCache:
+    """In-memory LRU cache with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 256, ttl: float = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.time():
+                del self._data[key]
+                self.evictions += 1
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def items(self):
+        now = time.time()
+        with self._lock:
+            return [
+                (key, value) for key, (value, expires_at) in self._data.items()
+                if expires_at is None or expires_at >= now
+            ]
+
+    def __len__(self):
+        return len(self._data)
+
+
+def connect_sqlite(path: str, isolation_level: str = "") -> sqlite3.Connection:
+    """Long-lived connection usable from any thread (callers serialize access to it)"""
+    conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=isolation_level)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL keeps the database consistent without an fsync on every commit
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SQLiteWriter:
+    """Applies writes to one SQLite file in order on a single background thread.
+
+    Callers on the event loop hand writes off instead of waiting for the
+    commit; WAL lets readers on other connections keep going meanwhile.
+    """
+
+    def __init__(self, path: str, name: str):
+        self.path = path
+        self._conn = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{name}-writer")
+
+    def submit(self, write, *args):
+        """Run write(conn, *args) on the writer thread; it commits its own transaction"""
+        return self._executor.submit(self._run, write, args)
+
+    def _run(self, write, args):
+        if self._conn is None:
+            self._conn = connect_sqlite(self.path)
+        try:
+            write(self._conn, *args)
+        except Exception as e:
+            log_error(f"Write to {self.path} failed: {e}", "sqlite-writer")
+
+    def flush(self):
+        """Wait until every write submitted so far is committed"""
+        self._executor.submit(lambda: None).result()
+
+
+class SQLiteCache:
+    """On-disk JSON cache backed by SQLite, safe to share across worker processes"""
+
+    def __init__(self, path: str, max_entries: int = 5000, ttl: float = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._evicted_at = 0.0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = connect_sqlite(path)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+        self._writer = SQLiteWriter(path, "cache")
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at < now:
+            self._writer.submit(self._delete, key)
+            self.evictions += 1
+            return None
+        self._writer.submit(self._touch, key, now)
+        return json.loads(value)
+
+    def set(self, key: str, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        self._writer.submit(self._write, key, json.dumps(value), expires_at, now)
+
+    def _write(self, conn, key: str, value: str, expires_at: float, now: float):
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now)
+            )
+            if now - self._evicted_at >= EVICT_INTERVAL:
+                self._evict(conn, now)
+                self._evicted_at = now
+
+    def _touch(self, conn, key: str, now: float):
+        with conn:
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+
+    def _delete(self, conn, key: str):
+        with conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def _clear(self, conn):
+        with conn:
+            conn.execute("DELETE FROM cache")
+
+    def _evict(self, conn, now: float):
+        """Drop expired rows, then the least recently used rows over the size limit"""
+        expired = conn.execute(
+            "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at < ?", (now,)
+        ).rowcount
+        count = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+        self.evictions += expired + max(overflow, 0)
+
+    def delete(self, key: str):
+        self._writer.submit(self._delete, key).result()
+
+    def clear(self):
+        self._writer.submit(self._clear).result()
+
+    def items(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM cache WHERE expires_at IS NULL OR expires_at >= ?", (time.time(),)
+            ).fetchall()
+        return [(key, json.loads(value)) for key, value in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class TieredCache:
+    """Memory LRU in front of an optional disk tier, with hit/miss counters"""
+
+    def __init__(self, memory: MemoryCache, disk: SQLiteCache = None):
+        self.memory = memory
+        self.disk = disk
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, value)
+                return value
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value, ttl: float = None):
+        self.memory.set(key, value, ttl)
+        if self.disk is not None:
+            self.disk.set(key, value, ttl)
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def items(self):
+        """All live entries; the disk tier is authoritative when present"""
+        return self.disk.items() if self.disk is not None else self.memory.items()
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "hits": hits,
+            "misses": self.misses,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "disk_entries": len(self.disk) if self.disk is not None else 0,
+            "evictions": self.memory.evictions + (self.disk.evictions if self.disk is not None else 0),
+        }
+
+
+def build_cache(name: str, max_entries: int, disk_max_entries: int, ttl: float) -> TieredCache:
+    """Create a tiered cache; the disk tier is skipped when CACHE_DIR is empty"""
+    disk = None
+    if CACHE_DIR:
+        disk = SQLiteCache(os.path.join(CACHE_DIR, f"{name}.sqlite3"), disk_max_entries, ttl)
+    return TieredCache(MemoryCache(max_entries, ttl), disk)
@@ -0,0 +1,67 @@
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from config import WORKER_POOL_SIZE, EXTRACT_PROCESSES, EXTRACT_PROCESS_NAME
+
+_executor = None
+_process_pool = None
+# Calls submitted to the thread pool and not yet finished (queued or running)
+_pending = 0
+
+def get_executor() -> ThreadPoolExecutor:
+    """App-lifetime pool for blocking document parsing, created on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=WORKER_POOL_SIZE, thread_name_prefix="parse-worker")
+    return _executor
+
+async def run_in_worker(func, *args, **kwargs):
+    """Run a blocking function on the shared pool without stalling the event loop"""
+    global _pending
+    loop = asyncio.get_running_loop()
+    _pending += 1
+    try:
+        return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+    finally:
+        _pending -= 1
+
+def executor_stats() -> dict:
+    return {"workers": WORKER_POOL_SIZE, "pending": _pending}
+
+class _ExtractionProcess(multiprocessing.get_context("spawn").Process):
+    """Spawned pool process named so the child can tell it is one (see logger._file_handler)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.name = f"{EXTRACT_PROCESS_NAME}-{self._identity[-1]}"
+
+class _ExtractionContext(type(multiprocessing.get_context("spawn"))):
+    Process = _ExtractionProcess
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """App-lifetime process pool for CPU-bound page extraction, created on first use"""
+    global _process_pool
+    if _process_pool is None:
+        # spawn: forking a process that already runs threads can deadlock the child
+        _process_pool = ProcessPoolExecutor(
+            max_workers=EXTRACT_PROCESSES,
+            mp_context=_ExtractionContext()
+        )
+    return _process_pool
+
+def discard_process_pool(pool: ProcessPoolExecutor):
+    """Drop a pool that raised BrokenProcessPool so get_process_pool builds a new one"""
+    global _process_pool
+    if _process_pool is pool:
+        _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def shutdown_executor():
+    global _executor, _process_pool
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
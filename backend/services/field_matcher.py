@@ -0,0 +1,225 @@
+import re
+from functools import lru_cache
+from config import FIELD_MATCH_THRESHOLD, FIELD_FALLBACK_THRESHOLD
+
+# Resume keys produced by ResumeParser and the phrases that identify them in a form label
+RESUME_FIELD_SYNONYMS = {
+    "Full Name": ["name", "full name", "your name", "first and last name", "candidate name",
+                  "applicant name", "legal name"],
+    "Email": ["email", "e-mail", "mail", "email address", "e-mail address", "email id"],
+    "Phone Number": ["phone", "phone number", "mobile", "mobile number", "contact number",
+                     "telephone", "cell", "whatsapp", "contact"],
+    "Address": ["address", "location", "city", "current location", "residence", "where do you live"],
+    "Education": ["education", "degree", "school", "university", "college", "qualification",
+                  "highest qualification", "academic background"],
+    "Work Experience": ["experience", "work experience", "work", "job", "employment",
+                        "work history", "employment history", "previous role"],
+    "Skills": ["skill", "skills", "abilities", "competencies", "technology", "technologies",
+               "tech stack", "technical skills"],
+    "Certifications": ["certification", "certificate", "license", "licence"],
+    "LinkedIn": ["linkedin", "linkedin profile", "linkedin url"],
+    "GitHub": ["github", "github profile", "github url"],
+    "Website": ["website", "personal website", "portfolio", "portfolio url"],
+}
+
+# Every resume key a form question can map to, whether or not a given resume has a value for it
+RESUME_KEYS = tuple(RESUME_FIELD_SYNONYMS)
+
+# Words that, next to a synonym, mean the label is about something else ("company name")
+BLOCKERS = {
+    "Full Name": ["company", "employer", "school", "university", "college", "reference", "manager", "user"],
+    "Address": ["email", "mail", "ip", "web", "website"],
+    # "Years of experience" wants a number, not the experience summary
+    "Work Experience": ["year", "yr", "many", "long"],
+}
+
+# Choice questions (Google Forms 2 multiple choice, 3 dropdown, 4 checkboxes, 5 linear
+# scale, 7 grid; FormAnalyzer radio/checkbox) take one of their options, never free text
+CHOICE_TYPES = (2, 3, 4, 5, 7, "radio", "checkbox", "select")
+CHOICE_PRIOR = {resume_key: -0.5 for resume_key in RESUME_FIELD_SYNONYMS}
+
+# Additive score adjustments by field type: HTML input types, FormAnalyzer types and
+# Google Forms question type codes (0 short answer, 1 paragraph)
+TYPE_PRIORS = {
+    "email": {"Email": 0.8},
+    "tel": {"Phone Number": 0.8},
+    "phone": {"Phone Number": 0.8},
+    "textarea": {"Work Experience": 0.1, "Skills": 0.1, "Education": 0.1,
+                 "Full Name": -0.2, "Email": -0.2, "Phone Number": -0.2},
+    1: {"Work Experience": 0.1, "Skills": 0.1, "Education": 0.1,
+        "Full Name": -0.2, "Email": -0.2, "Phone Number": -0.2},
+    **{field_type: CHOICE_PRIOR for field_type in CHOICE_TYPES},
+}
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "your", "you", "yours", "please", "enter", "provide",
+    "what", "whats", "do", "does", "of", "in", "on", "for", "to", "and", "or", "my", "me",
+    "list", "any", "current", "here", "below", "if", "have", "with", "this", "that", "these",
+    "those", "us", "we",
+}
+
+# Typo tolerance, by the length of the synonym word: swapped neighbouring letters
+# ("emial") from 5 letters, a wrong or missing letter ("adress") from 7. Shorter
+# words and extra letters collide with everyday words ("same" / "name",
+# "still" / "skill", "contract" / "contact")
+FUZZY_SWAP_MIN_LENGTH = 5
+FUZZY_EDIT_MIN_LENGTH = 7
+
+# Generic synonyms that lose to a specific one in the same label ("work email", "contact email")
+GENERIC_PHRASES = {"work", "job", "contact", "experience", "location"}
+GENERIC_WEIGHT = 0.9
+# Two resume keys scoring within this margin make the label ambiguous; its confidence
+# drops by AMBIGUITY_PENALTY so it is left to the LLM
+AMBIGUITY_MARGIN = 0.05
+AMBIGUITY_PENALTY = 0.3
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> tuple:
+    """Lowercase, split into tokens, drop stopwords and trailing plural 's'"""
+    text = str(text).lower().replace("e-mail", "email")
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tuple(tokens)
+
+
+def one_edit(typed: str, word: str):
+    """How `typed` differs from `word` by one edit: "swap", "substitute", "delete" (typed
+    misses a letter), "insert" (typed has an extra one), or None for no single edit"""
+    if len(typed) == len(word):
+        diffs = [i for i in range(len(typed)) if typed[i] != word[i]]
+        if len(diffs) == 1:
+            return "substitute"
+        if len(diffs) == 2 and diffs[1] == diffs[0] + 1 and typed[diffs[0]] == word[diffs[1]] and typed[diffs[1]] == word[diffs[0]]:
+            return "swap"
+        return None
+    if abs(len(typed) - len(word)) != 1:
+        return None
+    shorter, longer = (typed, word) if len(typed) < len(word) else (word, typed)
+    i = 0
+    while i < len(shorter) and shorter[i] == longer[i]:
+        i += 1
+    if shorter[i:] != longer[i + 1:]:
+        return None
+    return "delete" if shorter is typed else "insert"
+
+
+def is_typo_of(typed: str, word: str) -> bool:
+    """True when `typed` is a plausible one-letter typo of the synonym word `word`"""
+    edit = one_edit(typed, word)
+    if edit == "swap":
+        return len(word) >= FUZZY_SWAP_MIN_LENGTH
+    if edit in ("substitute", "delete"):
+        return len(word) >= FUZZY_EDIT_MIN_LENGTH
+    return False
+
+
+class FieldMatcher:
+    """Maps form question labels to resume keys with a confidence score.
+
+    Synonyms are normalized once into a token index. A label scores against
+    every synonym whose tokens it contains (exact or within one edit for
+    longer words); longer synonyms covering more of the label score higher,
+    specific synonyms beat generic ones, and near-ties between resume keys
+    are not confident. Choice questions score low: a resume value rarely matches one of their options.
+    """
+
+    def __init__(self, synonyms: dict = None, blockers: dict = None, type_priors: dict = None):
+        self.synonyms = synonyms or RESUME_FIELD_SYNONYMS
+        self.blockers = {key: set(words) for key, words in (blockers or BLOCKERS).items()}
+        self.type_priors = type_priors or TYPE_PRIORS
+
+        self._phrases = []
+        self._index = {}
+        for resume_key, phrases in self.synonyms.items():
+            for phrase in phrases:
+                tokens = normalize(phrase)
+                if not tokens:
+                    continue
+                phrase_id = len(self._phrases)
+                self._phrases.append((resume_key, tokens))
+                for token in tokens:
+                    self._index.setdefault(token, set()).add(phrase_id)
+        self._vocabulary = tuple(self._index)
+        self._generic = {normalize(phrase) for phrase in GENERIC_PHRASES}
+        self._match_tokens = lru_cache(maxsize=4096)(self._match_tokens_uncached)
+
+    def match(self, label: str, field_type=None) -> tuple:
+        """Return (resume_key, confidence); resume_key is None when nothing matches"""
+        scores = dict(self._match_tokens(normalize(label or "")))
+        for resume_key, adjustment in self.type_priors.get(field_type, {}).items():
+            if resume_key in scores or adjustment > 0:
+                scores[resume_key] = scores.get(resume_key, 0.0) + adjustment
+        if not scores:
+            return None, 0.0
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        resume_key, score = ranked[0]
+        if len(ranked) > 1 and score - ranked[1][1] < AMBIGUITY_MARGIN:
+            score -= AMBIGUITY_PENALTY
+        confidence = round(min(max(score, 0.0), 1.0), 3)
+        if confidence <= 0:
+            return None, 0.0
+        return resume_key, confidence
+
+    def is_confident(self, confidence: float) -> bool:
+        return confidence >= FIELD_MATCH_THRESHOLD
+
+    def is_plausible(self, confidence: float) -> bool:
+        """Good enough to fill when the LLM is unavailable"""
+        return confidence >= FIELD_FALLBACK_THRESHOLD
+
+    def _resolve_token(self, token: str):
+        """Index token for a label token: exact match, else the first one within one edit"""
+        if token in self._index:
+            return token, 1.0
+        if len(token) >= FUZZY_SWAP_MIN_LENGTH - 1:
+            for candidate in self._vocabulary:
+                if is_typo_of(token, candidate):
+                    return candidate, 0.85
+        return None, 0.0
+
+    def _match_tokens_uncached(self, tokens: tuple) -> tuple:
+        if not tokens:
+            return ()
+
+        resolved = {}
+        for token in tokens:
+            index_token, weight = self._resolve_token(token)
+            if index_token and weight > resolved.get(index_token, 0.0):
+                resolved[index_token] = weight
+
+        candidates = set()
+        for index_token in resolved:
+            candidates.update(self._index[index_token])
+
+        scores = {}
+        label_length = len(tokens)
+        for phrase_id in candidates:
+            resume_key, phrase_tokens = self._phrases[phrase_id]
+            if not all(token in resolved for token in phrase_tokens):
+                continue
+            if self.blockers.get(resume_key) and self.blockers[resume_key] & set(tokens):
+                continue
+            weight = min(resolved[token] for token in phrase_tokens)
+            if phrase_tokens in self._generic:
+                weight *= GENERIC_WEIGHT
+            coverage = min(len(phrase_tokens) / label_length, 1.0)
+            score = weight * (0.6 + 0.4 * coverage) + 0.05 * (len(phrase_tokens) - 1)
+            if score > scores.get(resume_key, 0.0):
+                scores[resume_key] = score
+        return tuple(scores.items())
+
+
+_field_matcher = None
+
+def get_field_matcher() -> FieldMatcher:
+    global _field_matcher
+    if _field_matcher is None:
+        _field_matcher = FieldMatcher()
+    return _field_matcher
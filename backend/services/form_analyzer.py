@@ -1,27 +1,30 @@
 import os
+import asyncio
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import json
-import time
 from logger import log_form_fields, log_error
-from llama_index.llms.openrouter import OpenRouter
+from services.browser_pool import get_browser_pool
+from services.page_readiness import PageReadiness
+from services.mapping_cache import get_mapping_cache
+from services.llm_gateway import get_llm
+
+# Categories the analyzer reports, and the resume key each one stands for
+CATEGORY_RESUME_KEYS = {
+    "name": "Full Name",
+    "email": "Email",
+    "phone": "Phone Number",
+    "address": "Address",
+    "education": "Education",
+    "experience": "Work Experience",
+    "skills": "Skills",
+    "certifications": "Certifications",
+    "other": None,
+}
 
 class FormAnalyzer:
     def __init__(self):
-        self.openrouter_key = os.getenv("OPENROUTER_API_KEY")
-        
-        # Initialize OpenRouter LLM
-        if self.openrouter_key:
-            self.llm = OpenRouter(
-                api_key=self.openrouter_key,
-                model="mistralai/mistral-7b-instruct:free",
-                max_tokens=500,
-                temperature=0.1
-            )
+        # Shared OpenRouter gateway (None without an API key)
+        self.llm = get_llm(max_tokens=500, temperature=0.1)
     
     async def analyze_google_form(self, form_url: str) -> dict:
         try:
@@ -42,28 +45,19 @@ class FormAnalyzer:
             return {"fields": [], "mappings": {}}
     
     async def _get_form_html(self, url: str) -> str:
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
+        async with get_browser_pool().driver_async() as driver:
+            # Selenium calls block, so they run off the event loop
+            return await asyncio.to_thread(self._load_form_html, driver, url)
+    
+    def _load_form_html(self, driver, url: str) -> str:
+        readiness = PageReadiness(driver)
+        driver.get(url)
         
-        driver = webdriver.Chrome(options=options)
-        try:
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            driver.get(url)
-            
-            # Wait for dynamic content to load
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            time.sleep(3)  # Additional wait for Google Forms to fully load
-            
-            return driver.page_source
-        finally:
-            driver.quit()
+        # Wait for dynamic content to load
+        readiness.document_ready()
+        readiness.form_ready()
+        
+        return driver.page_source
     
     def _extract_form_fields(self, html: str) -> list:
         soup = BeautifulSoup(html, 'html.parser')
@@ -139,15 +133,30 @@ class FormAnalyzer:
         return fields
     
     async def _analyze_fields_with_ai(self, fields: list) -> dict:
-        """Analyze form fields using OpenRouter LLM"""
+        """Analyze form fields using OpenRouter LLM, skipping labels already in the mapping memo"""
+        mapping_cache = get_mapping_cache()
+        key_categories = {key: category for category, key in CATEGORY_RESUME_KEYS.items() if key}
+        mappings = {}
+        uncached = []
+        
+        for field in fields:
+            cached = mapping_cache.get(field['label'], field['type'])
+            if cached is None:
+                uncached.append(field)
+            else:
+                mappings[field['label']] = key_categories.get(cached[0], 'other')
+        
+        if not uncached:
+            return {"mappings": mappings}
+        
         prompt = f"""
 Analyze these form fields and map them to resume data categories:
-{json.dumps(fields, indent=2)}
+{json.dumps(uncached, indent=2)}
 
 Map each field to one of these categories:
 - name, email, phone, address, education, experience, skills, certifications, other
 
-Return JSON with field mappings.
+Return JSON of the form {{"mappings": {{"<field label>": "<category>"}}}}.
 """
         
         try:
@@ -160,8 +169,16 @@ Return JSON with field mappings.
             elif '```' in content:
                 content = content.split('```')[1].split('```')[0]
             
-            return json.loads(content.strip())
+            ai_mappings = json.loads(content.strip()).get('mappings', {})
+            for field in uncached:
+                category = ai_mappings.get(field['label'])
+                if category in CATEGORY_RESUME_KEYS:
+                    resume_key = CATEGORY_RESUME_KEYS[category]
+                    mapping_cache.set(field['label'], field['type'], resume_key, 0.8 if resume_key else 0.0)
+                    mappings[field['label']] = category
+            
+            return {"mappings": mappings}
             
         except Exception as e:
             log_error(f"AI field analysis failed: {e}", "form-analyzer")
-            return {"fields": fields, "mappings": {}}
\ No newline at end of file
+            return {"fields": fields, "mappings": mappings}
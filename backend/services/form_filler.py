@@ -1,50 +1,116 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-import time
 import re
 import json
 import os
+import asyncio
 from logger import log_error
-from llama_index.llms.openrouter import OpenRouter
+from services.browser_pool import get_browser_pool
+from services.page_readiness import PageReadiness
+from services.field_matcher import get_field_matcher, RESUME_KEYS
+from services.mapping_cache import get_mapping_cache
+from services.llm_gateway import get_llm
+from services.metrics import span
+from config import FILL_MODE
+
+# Sets each [element, value] pair through the native value setter (so the page's
+# listeners see a real edit) and fires the events Google Forms listens for
+BULK_FILL_SCRIPT = """
+var items = arguments[0];
+var events = ['focus', 'input', 'change', 'keydown', 'keyup', 'blur'];
+items.forEach(function(item) {
+    var element = item[0], value = item[1];
+    try {
+        if (element.tagName === 'INPUT' || element.tagName === 'TEXTAREA') {
+            var proto = element.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+            Object.getOwnPropertyDescriptor(proto, 'value').set.call(element, value);
+        } else {
+            element.textContent = value;
+        }
+        events.forEach(function(name) {
+            element.dispatchEvent(new Event(name, {bubbles: true}));
+        });
+    } catch (e) {}
+});
+"""
+
+# Collects every fillable element with its visibility, enabled state and label
+# in one round trip, using the same selectors and label rules as
+# _find_all_form_elements and _get_field_context
+SNAPSHOT_SCRIPT = """
+var selectors = [
+    "input[type='text']", "input[type='email']", "input[type='tel']", "input[type='url']",
+    "input:not([type])", "input[type='']", "textarea", "div[role='textbox']",
+    "div[contenteditable='true']", "input[class*='whsOnd']", "textarea[class*='KHxj8b']",
+    "div[class*='quantumWizTextinputPaperinputInput']"
+];
+function text(node) {
+    return node ? (node.innerText || node.textContent || '').trim() : '';
+}
+function nthDivAncestor(element, n) {
+    var node = element.parentElement;
+    while (node) {
+        if (node.tagName === 'DIV' && --n === 0) return node;
+        node = node.parentElement;
+    }
+    return null;
+}
+var seen = new Set();
+var fields = [];
+document.querySelectorAll(selectors.join(',')).forEach(function(element) {
+    if (seen.has(element)) return;
+    seen.add(element);
+
+    var style = window.getComputedStyle(element);
+    var visible = style.visibility !== 'hidden' && style.display !== 'none' && element.getClientRects().length > 0;
+    var enabled = !element.disabled && element.getAttribute('aria-disabled') !== 'true';
+
+    var container = element.closest("div[class*='Qr7Oae']");
+    var question = container ? text(container.querySelector("span[class*='M7eMe']")) : '';
+    var describedBy = element.getAttribute('aria-describedby');
+    var description = describedBy ? text(document.getElementById(describedBy.split(' ')[0])) : '';
+
+    var label = element.getAttribute('aria-label') || description || question || element.getAttribute('placeholder') || '';
+    if (!label) {
+        label = text(nthDivAncestor(element, 2)).split('\\n')[0];
+    }
+
+    fields.push({
+        element: element,
+        visible: visible,
+        enabled: enabled,
+        label: label,
+        description: description,
+        question: question
+    });
+});
+return fields;
+"""
+
+READ_VALUES_SCRIPT = """
+return arguments[0].map(function(element) {
+    return (element.tagName === 'INPUT' || element.tagName === 'TEXTAREA') ? element.value : element.textContent;
+});
+"""
 
 class FormFiller:
     def __init__(self):
         self.driver = None
-        self.openrouter_key = os.getenv("OPENROUTER_API_KEY")
-        
-        # Initialize OpenRouter LLM
-        if self.openrouter_key:
-            self.llm = OpenRouter(
-                api_key=self.openrouter_key,
-                model="mistralai/mistral-7b-instruct:free",
-                max_tokens=1000,
-                temperature=0.1
-            )
+        self.readiness = None
+        # Shared OpenRouter gateway (None without an API key)
+        self.llm = get_llm(max_tokens=1000, temperature=0.1)
     
     async def fill_form(self, form_url: str, resume_data: dict, form_fields: dict) -> dict:
         try:
-            self._setup_driver()
-            self.driver.get(form_url)
+            with span("filler.driver_startup"):
+                await self._setup_driver()
+            self.readiness = PageReadiness(self.driver)
             
             filled_fields = []
             
-            # Wait for form to load
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            time.sleep(5)  # Increased wait for Google Forms to fully load
-            
-            # Wait for form inputs to be ready
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, "//input | //textarea"))
-                )
-            except:
-                pass  # Continue even if no inputs found immediately
+            # Selenium calls block, so they run off the event loop (asyncio.to_thread)
+            with span("filler.page_load"):
+                await asyncio.to_thread(self._load_page, form_url)
             
             # Handle case where resume_data might be a coroutine
             if hasattr(resume_data, 'keys'):
@@ -53,7 +119,6 @@ class FormFiller:
                 print(f"Resume data type: {type(resume_data)}")
                 print(f"Resume data: {resume_data}")
             print(f"Form fields count: {len(form_fields.get('fields', []))}")
-            print(f"Page title: {self.driver.title}")
             
             # Debug resume data
             print(f"Resume data received: {resume_data}")
@@ -71,45 +136,51 @@ class FormFiller:
             print(f"Filled fields: {filled_fields}")
             
             if filled_fields:  # Only submit if we filled something
-                time.sleep(2)  # Wait before submission
-                submission_success = self._attempt_form_submission()
+                with span("filler.submit"):
+                    submission_success = await asyncio.to_thread(self._submit_when_idle)
                 if submission_success:
                     print("Form submitted successfully!")
                 else:
                     print("Form submission failed or no submit button found")
             
+            timing = self.readiness.timer.report()
+            print(f"Form timing: {timing}")
+            
             return {
                 "success": True,
                 "filled_fields": filled_fields,
-                "message": f"Successfully filled {len(filled_fields)} fields"
+                "message": f"Successfully filled {len(filled_fields)} fields",
+                "timing": timing
             }
             
         except Exception as e:
             log_error(f"Form filling failed: {e}", "form-filler")
-            return {
+            result = {
                 "success": False,
                 "error": str(e)
             }
+            if self.readiness:
+                result["timing"] = self.readiness.timer.report()
+            return result
         finally:
             if self.driver:
-                self.driver.quit()
+                await get_browser_pool().release_async(self.driver)
+                self.driver = None
+    
+    async def _setup_driver(self):
+        """Check out a warm driver from the shared browser pool"""
+        self.driver = await get_browser_pool().acquire_async()
     
-    def _setup_driver(self):
-        options = Options()
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-plugins")
-        options.add_argument("--disable-images")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        options.add_experimental_option("prefs", {
-            "profile.default_content_setting_values.notifications": 2
-        })
-        self.driver = webdriver.Chrome(options=options)
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        self.driver.set_window_size(1920, 1080)
+    def _load_page(self, form_url: str):
+        """Wait for the page, then for form inputs to be interactable"""
+        self.driver.get(form_url)
+        self.readiness.document_ready()
+        self.readiness.form_ready()  # Continue even if no inputs found in time
+        print(f"Page title: {self.driver.title}")
+    
+    def _submit_when_idle(self) -> bool:
+        self.readiness.network_idle()  # Let pending autosave/validation requests settle
+        return self._attempt_form_submission()
     
     def _fill_field(self, field: dict, resume_data: dict) -> bool:
         try:
@@ -117,7 +188,7 @@ class FormFiller:
             field_type = field['type']
             
             # Determine what data to fill based on field label
-            value = self._get_value_for_field(label, resume_data)
+            value = self._get_value_for_field(label, resume_data, field_type)
             
             if not value:
                 print(f"No value found for field: {field['label']}")
@@ -132,16 +203,14 @@ class FormFiller:
             
             # Scroll to element
             self.driver.execute_script("arguments[0].scrollIntoView(true);", input_element)
-            time.sleep(0.5)
+            self.readiness.interactable(input_element)
             
             # Fill based on field type
             if field_type in ['text', 'email', 'phone', 'textarea']:
                 input_element.click()
-                time.sleep(0.5)
                 input_element.clear()
-                time.sleep(0.5)
                 input_element.send_keys(str(value))
-                time.sleep(0.5)
+                self.readiness.value_committed(input_element, value)
                 # Trigger events to ensure Google Forms registers the input
                 self.driver.execute_script("arguments[0].dispatchEvent(new Event('input', {bubbles: true}));", input_element)
                 self.driver.execute_script("arguments[0].dispatchEvent(new Event('change', {bubbles: true}));", input_element)
@@ -158,27 +227,10 @@ class FormFiller:
             print(f"Error filling field {field['label']}: {e}")
             return False
     
-    def _get_value_for_field(self, label: str, resume_data: dict) -> str:
-        label_lower = label.lower()
-        
-        # More comprehensive field matching
-        if any(word in label_lower for word in ['name', 'full name', 'your name']):
-            return resume_data.get('Full Name', '')
-        elif any(word in label_lower for word in ['email', 'e-mail', 'mail']):
-            return resume_data.get('Email', '')
-        elif any(word in label_lower for word in ['phone', 'mobile', 'contact', 'number']):
-            return resume_data.get('Phone Number', '')
-        elif any(word in label_lower for word in ['address', 'location', 'city']):
-            return resume_data.get('Address', '')
-        elif any(word in label_lower for word in ['education', 'degree', 'school', 'university']):
-            return self._format_education(resume_data.get('Education', []))
-        elif any(word in label_lower for word in ['experience', 'work', 'job', 'employment']):
-            return self._format_experience(resume_data.get('Work Experience', []))
-        elif any(word in label_lower for word in ['skill', 'abilities', 'competencies']):
-            return self._format_skills(resume_data.get('Skills', []))
-        elif any(word in label_lower for word in ['certification', 'certificate', 'license']):
-            certs = resume_data.get('Certifications', [])
-            return ', '.join(certs) if isinstance(certs, list) else str(certs)
+    def _get_value_for_field(self, label: str, resume_data: dict, field_type: str = None) -> str:
+        resume_key, _ = get_field_matcher().match(label, field_type)
+        if resume_key:
+            return self._format_resume_value(resume_key, resume_data)
         
         # Fallback - return first available data
         for key, value in resume_data.items():
@@ -187,6 +239,19 @@ class FormFiller:
         
         return ''
     
+    def _format_resume_value(self, resume_key: str, resume_data: dict) -> str:
+        """Render a resume value as text for a form field"""
+        value = resume_data.get(resume_key, '')
+        if resume_key == 'Education':
+            return self._format_education(value)
+        elif resume_key == 'Work Experience':
+            return self._format_experience(value)
+        elif resume_key == 'Skills':
+            return self._format_skills(value)
+        elif resume_key == 'Certifications':
+            return ', '.join(value) if isinstance(value, list) else str(value)
+        return str(value) if value else ''
+    
     def _find_input_element(self, field: dict):
         try:
             label = field['label']
@@ -244,49 +309,92 @@ class FormFiller:
         filled_fields = []
         
         try:
-            # Wait for form to be interactive
-            time.sleep(3)
-            
-            # Find all form elements
-            form_elements = self._find_all_form_elements()
-            print(f"Found {len(form_elements)} form elements")
-            
-            # Get field contexts for AI analysis
-            field_contexts = []
-            for i, element in enumerate(form_elements):
-                if element.is_displayed() and element.is_enabled():
-                    context = self._get_field_context(element)
-                    field_contexts.append({
-                        'index': i,
-                        'context': context,
-                        'element': element
-                    })
+            # Discover fields and their contexts in a single WebDriver call
+            with span("filler.discovery"):
+                field_contexts = await asyncio.to_thread(self._discover_fields)
+            print(f"Found {len(field_contexts)} fillable form fields")
             
             # Use AI to map fields to resume data
-            field_mappings = await self._get_ai_field_mappings(field_contexts, resume_data, form_fields)
+            with span("filler.mapping"):
+                field_mappings = await self._get_ai_field_mappings(field_contexts, resume_data, form_fields)
             
-            # Fill fields based on AI mappings
-            for mapping in field_mappings:
-                try:
-                    element = mapping['element']
-                    value = mapping['value']
-                    field_name = mapping['field_name']
-                    
-                    if value and value.strip():
-                        success = self._fill_element_safely(element, value)
-                        if success:
-                            filled_fields.append(f"{field_name}: {value[:50]}...")
-                            print(f"AI-filled '{field_name}' with: {value[:50]}...")
-                            
-                except Exception as e:
-                    print(f"Error filling AI-mapped field: {e}")
-                    continue
+            with span("filler.fill"):
+                filled_fields = await asyncio.to_thread(self._apply_mappings, field_mappings)
                     
         except Exception as e:
             print(f"Error in AI form filling: {e}")
             
         return filled_fields
     
+    def _discover_fields(self) -> list:
+        """Field contexts from a single WebDriver call, or element by element if that fails"""
+        field_contexts = self._snapshot_form_fields()
+        if field_contexts is None:
+            field_contexts = self._discover_fields_per_element()
+        return field_contexts
+    
+    def _apply_mappings(self, field_mappings: list) -> list:
+        """Fill fields based on AI mappings, in one scripted pass when possible"""
+        filled_fields = []
+        to_fill = [m for m in field_mappings if m['value'] and str(m['value']).strip()]
+        if FILL_MODE == "bulk" and to_fill:
+            needs_keystrokes = self._fill_elements_bulk(to_fill)
+        else:
+            needs_keystrokes = to_fill
+        retry_ids = {id(m) for m in needs_keystrokes}
+        
+        for mapping in to_fill:
+            try:
+                element = mapping['element']
+                value = str(mapping['value'])
+                field_name = mapping['field_name']
+                
+                # Keystroke path only for fields whose bulk value did not stick
+                success = True
+                if id(mapping) in retry_ids:
+                    success = self._fill_element_safely(element, value)
+                if success:
+                    filled_fields.append(f"{field_name}: {value[:50]}...")
+                    print(f"AI-filled '{field_name}' with: {value[:50]}...")
+                
+            except Exception as e:
+                print(f"Error filling AI-mapped field: {e}")
+                continue
+        
+        return filled_fields
+    
+    def _snapshot_form_fields(self):
+        """Collect visible, enabled fields with their labels in one script call"""
+        try:
+            snapshot = self.driver.execute_script(SNAPSHOT_SCRIPT)
+        except Exception as e:
+            print(f"DOM snapshot failed, falling back to per-element discovery: {e}")
+            return None
+        
+        field_contexts = []
+        for field in snapshot:
+            if field['visible'] and field['enabled']:
+                field_contexts.append({
+                    'index': len(field_contexts),
+                    'context': (field['label'] or 'unknown').lower(),
+                    'description': field['description'],
+                    'question': field['question'],
+                    'element': field['element']
+                })
+        return field_contexts
+    
+    def _discover_fields_per_element(self):
+        """Slow path: one XPath query per selector plus several calls per element"""
+        field_contexts = []
+        for element in self._find_all_form_elements():
+            if element.is_displayed() and element.is_enabled():
+                field_contexts.append({
+                    'index': len(field_contexts),
+                    'context': self._get_field_context(element),
+                    'element': element
+                })
+        return field_contexts
+    
     def _find_all_form_elements(self):
         """Find all fillable form elements in Google Forms"""
         selectors = [
@@ -359,55 +467,35 @@ class FormFiller:
             return "unknown"
     
     def _fallback_field_mapping(self, field_contexts: list, resume_data: dict) -> list:
-        """Fallback mapping when AI fails"""
+        """Fallback mapping when AI fails: local matches that are plausible, if not confident"""
+        return self._local_field_mappings(field_contexts, resume_data, fallback=True)[0]
+    
+    def _local_field_mappings(self, field_contexts: list, resume_data: dict, fallback: bool = False):
+        """Map fields with the local matcher; returns (mappings, unresolved field contexts)"""
+        matcher = get_field_matcher()
         mappings = []
-        data_map = {
-            'name': resume_data.get('Full Name', ''),
-            'email': resume_data.get('Email', ''),
-            'phone': resume_data.get('Phone Number', ''),
-            'address': resume_data.get('Address', ''),
-            'education': str(resume_data.get('Education', '')),
-            'experience': str(resume_data.get('Work Experience', '')),
-            'skills': str(resume_data.get('Skills', ''))
-        }
+        unresolved = []
         
         for field in field_contexts:
-            context = field['context'].lower()
-            value = ''
-            field_name = context
-            
-            # Simple pattern matching as fallback
-            if any(word in context for word in ['name', 'full name']):
-                value = data_map['name']
-                field_name = 'Name'
-            elif any(word in context for word in ['email', 'mail']):
-                value = data_map['email']
-                field_name = 'Email'
-            elif any(word in context for word in ['phone', 'mobile', 'contact']):
-                value = data_map['phone']
-                field_name = 'Phone'
-            elif any(word in context for word in ['skill', 'technology']):
-                value = data_map['skills']
-                field_name = 'Skills'
-            elif any(word in context for word in ['education', 'degree']):
-                value = data_map['education']
-                field_name = 'Education'
-            elif any(word in context for word in ['experience', 'work', 'job']):
-                value = data_map['experience']
-                field_name = 'Experience'
-            
-            if value and str(value).strip():
+            resume_key, confidence = matcher.match(field['context'], field.get('type'))
+            confident = matcher.is_plausible(confidence) if fallback else matcher.is_confident(confidence)
+            value = self._format_resume_value(resume_key, resume_data) if resume_key and confident else ''
+            
+            if value and value.strip():
                 mappings.append({
                     'element': field['element'],
-                    'field_name': field_name,
-                    'value': str(value),
-                    'confidence': 0.8
+                    'field_name': resume_key,
+                    'value': value,
+                    'confidence': confidence
                 })
+            else:
+                unresolved.append(field)
         
-        return mappings
+        return mappings, unresolved
     
     async def _get_ai_field_mappings(self, field_contexts: list, resume_data: dict, form_fields: dict) -> list:
-        """Use AI to intelligently map form fields to resume data"""
+        """Map fields locally where confident, and use AI only for the rest"""
+        local_mappings, unresolved = [], field_contexts
         try:
             # Prepare context for AI
             fields_info = []
@@ -425,16 +513,32 @@ class FormFiller:
                         fields_info[i]['label'] = form_field.get('label', '')
                         fields_info[i]['type'] = form_field.get('type', 'text')
             
+            # Confident local matches skip the LLM entirely
+            for field, info in zip(field_contexts, fields_info):
+                field['type'] = info['type']
+            local_mappings, unresolved = self._local_field_mappings(field_contexts, resume_data)
+            
+            # Then questions already answered by an earlier LLM call
+            cached_mappings, unresolved = self._cached_field_mappings(unresolved, resume_data)
+            local_mappings += cached_mappings
+            if not unresolved:
+                print(f"Mapped all {len(local_mappings)} fields without the LLM")
+                return local_mappings
+            unresolved_indexes = {field['index'] for field in unresolved}
+            fields_info = [info for info in fields_info if info['index'] in unresolved_indexes]
+            
             prompt = f"""
 You are an AI assistant that maps form fields to resume data. 
 
+Resume fields: {json.dumps(list(RESUME_KEYS))}
+
 Resume Data:
 {json.dumps(resume_data, indent=2)}
 
 Form Fields:
 {json.dumps(fields_info, indent=2)}
 
-For each form field, determine the best matching resume data value. Return a JSON array with mappings:
+For each form field, determine which resume field answers it and its value. Return a JSON array with one mapping per form field:
 
 [
   {{
@@ -447,8 +551,8 @@ For each form field, determine the best matching resume data value. Return a JSO
 ]
 
 Rules:
-- Only include mappings with confidence > 0.7
-- Use exact values from resume data
+- resume_key is one of the resume fields above, even when this resume has no value for it, or null if none fits
+- value is the exact value from resume data, or "" when the resume has none or confidence is 0.7 or lower
 - Match field context/label to appropriate resume data
 - Return valid JSON only
 """
@@ -456,10 +560,11 @@ Rules:
             # Use OpenRouter LLM
             if not self.llm:
                 print("OpenRouter LLM not initialized")
-                return self._fallback_field_mapping(field_contexts, resume_data)
+                return local_mappings + self._fallback_field_mapping(unresolved, resume_data)
             
             try:
-                response = await self.llm.acomplete(prompt)
+                with span("filler.llm"):
+                    response = await self.llm.acomplete(prompt)
                 content = str(response)
                 
                 # Clean and parse JSON
@@ -473,17 +578,32 @@ Rules:
                 
                 # Convert AI mappings to element mappings
                 element_mappings = []
+                mapped_keys = {}
                 for mapping in ai_mappings:
                     field_index = mapping.get('field_index', -1)
-                    if 0 <= field_index < len(field_contexts):
-                        element_mappings.append({
-                            'element': field_contexts[field_index]['element'],
-                            'field_name': mapping.get('field_name', f'Field {field_index}'),
-                            'value': mapping.get('value', ''),
-                            'confidence': mapping.get('confidence', 0.0)
-                        })
+                    if field_index in unresolved_indexes:
+                        resume_key = mapping.get('resume_key')
+                        if resume_key in RESUME_KEYS:
+                            mapped_keys[field_index] = (resume_key, mapping.get('confidence', 0.0))
+                        else:
+                            mapped_keys[field_index] = (None, 0.0)
+                        if mapping.get('value'):
+                            element_mappings.append({
+                                'element': field_contexts[field_index]['element'],
+                                'field_name': mapping.get('field_name', f'Field {field_index}'),
+                                'value': mapping['value'],
+                                'confidence': mapping.get('confidence', 0.0)
+                            })
                 
-                return element_mappings
+                # Remember the answers, including "no resume field fits", for the fields the LLM answered;
+                # they describe the question, so they hold for candidates whose resume has other fields
+                mapping_cache = get_mapping_cache()
+                for field in unresolved:
+                    if field['index'] in mapped_keys:
+                        resume_key, confidence = mapped_keys[field['index']]
+                        mapping_cache.set(field['context'], field.get('type'), resume_key, confidence)
+                
+                return local_mappings + element_mappings
                 
             except json.JSONDecodeError as e:
                 print(f"Failed to parse AI response: {e}")
@@ -494,21 +614,63 @@ Rules:
             print(f"Error in AI field mapping: {e}")
         
         # Fallback to simple mapping if AI fails
-        return self._fallback_field_mapping(field_contexts, resume_data)
+        return local_mappings + self._fallback_field_mapping(unresolved, resume_data)
+    
+    def _cached_field_mappings(self, field_contexts: list, resume_data: dict):
+        """Resolve fields from the mapping memo; returns (mappings, fields never seen before)"""
+        mapping_cache = get_mapping_cache()
+        mappings = []
+        unseen = []
+        
+        for field in field_contexts:
+            cached = mapping_cache.get(field['context'], field.get('type'))
+            if cached is None:
+                unseen.append(field)
+                continue
+            resume_key, confidence = cached
+            value = self._format_resume_value(resume_key, resume_data) if resume_key else ''
+            if value and value.strip():
+                mappings.append({
+                    'element': field['element'],
+                    'field_name': resume_key,
+                    'value': value,
+                    'confidence': confidence
+                })
+        
+        return mappings, unseen
+    
+    def _fill_elements_bulk(self, mappings: list) -> list:
+        """Set all mapped values in one script call; return the mappings whose value did not stick"""
+        try:
+            items = [[m['element'], str(m['value'])] for m in mappings]
+            self.driver.execute_script(BULK_FILL_SCRIPT, items)
+            
+            # Read back in a second call, after the page's handlers have run
+            elements = [m['element'] for m in mappings]
+            current_values = self.driver.execute_script(READ_VALUES_SCRIPT, elements)
+        except Exception as e:
+            print(f"Bulk fill failed, falling back to keystrokes: {e}")
+            return mappings
+        
+        failed = [
+            mapping for mapping, current in zip(mappings, current_values)
+            if str(mapping['value']) not in (current or '')
+        ]
+        print(f"Bulk-filled {len(mappings) - len(failed)}/{len(mappings)} fields")
+        return failed
     
     def _fill_element_safely(self, element, value):
         """Safely fill element with proper events"""
         try:
             # Scroll to element
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(0.5)
+            self.readiness.interactable(element)
             
             # Focus on element with multiple methods
             try:
                 element.click()
             except:
                 self.driver.execute_script("arguments[0].focus();", element)
-            time.sleep(0.3)
             
             # Clear existing content with multiple methods
             try:
@@ -523,14 +685,8 @@ Rules:
             except:
                 pass
             
-            time.sleep(0.2)
-            
-            # Type the value character by character for better compatibility
-            for char in str(value):
-                element.send_keys(char)
-                time.sleep(0.01)  # Small delay between characters
-            
-            time.sleep(0.3)
+            # WebDriver already types the value key by key
+            element.send_keys(str(value))
             
             # Trigger comprehensive events for Google Forms
             self.driver.execute_script("""
@@ -545,14 +701,12 @@ Rules:
                 element.dispatchEvent(new Event('keydown', {bubbles: true}));
             """, element)
             
-            time.sleep(0.3)
-            
             # Verify the value was set
-            current_value = element.get_attribute('value') or element.text
-            if current_value and str(value) in current_value:
+            if self.readiness.value_committed(element, value):
                 print(f"Successfully filled field with: {value[:50]}...")
                 return True
             else:
+                current_value = element.get_attribute('value') or element.text
                 print(f"Value verification failed. Expected: {value[:50]}, Got: {current_value}")
                 return False
             
@@ -580,12 +734,15 @@ Rules:
                     submit_btn = self.driver.find_element(By.XPATH, selector)
                     if submit_btn.is_displayed() and submit_btn.is_enabled():
                         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", submit_btn)
-                        time.sleep(1)
+                        self.readiness.interactable(submit_btn)
                         
                         # Try clicking with JavaScript first
+                        previous_url = self.driver.current_url
                         self.driver.execute_script("arguments[0].click();", submit_btn)
-                        print("Form submitted successfully with JavaScript")
-                        time.sleep(3)
+                        if self.readiness.submission_confirmed(previous_url):
+                            print("Form submitted successfully with JavaScript")
+                        else:
+                            print("Submit clicked but no confirmation page seen")
                         return True
                 except:
                     continue
@@ -0,0 +1,33 @@
+from services.resume_parser import ResumeParser
+from services.google_forms_service import GoogleFormsService
+from services.progress import stage_reporter
+from services.uploads import StoredUpload
+
+FILL_FORM = "fill_form"
+
+
+async def run_fill_job(task_id: str, form_url: str, upload: StoredUpload) -> dict:
+    """Parse the resume and submit it to the form; the caller owns the upload and the final task state.
+
+    Returns the submit result; `retryable` is set on it when the failure was
+    a transient upstream one that a later attempt may get past.
+    """
+    report = stage_reporter(task_id)
+
+    # Only parse as deeply as the form needs: contact-only forms never reach the LLM
+    google_forms = GoogleFormsService()
+    needed_fields = await google_forms.resume_keys_for_form(form_url)
+
+    # Text extraction runs on the shared worker pool, LLM calls stay on the event loop
+    resume_data = await ResumeParser().extract_upload(upload, on_progress=report, fields=needed_fields)
+
+    return await google_forms.submit_form_response(form_url, resume_data, on_progress=report)
+
+
+def fill_job_payload(form_url: str, upload: StoredUpload) -> dict:
+    """JSON payload of a queued fill job; the upload file lives in UPLOAD_TMP_DIR, which the workers share"""
+    return {"form_url": form_url, "upload": vars(upload)}
+
+
+def upload_from_payload(payload: dict) -> StoredUpload:
+    return StoredUpload(**payload["upload"])
@@ -0,0 +1,105 @@
+import re
+import json
+
+LOAD_DATA_VARIABLE = "FB_PUBLIC_LOAD_DATA_"
+ASSIGNMENT_PATTERN = re.compile(r"\s*=\s*")
+# Google Forms item type codes
+SECTION_HEADER_TYPE = 8
+_decoder = json.JSONDecoder()
+
+
+class FormEntry:
+    """One answerable input of a Google Form (grid rows and multi-input items yield several)"""
+
+    __slots__ = ("id", "title", "type", "required", "options", "page", "section")
+
+    def __init__(self, id: int, title: str, type: int, required: bool, options: list = None,
+                 page: int = 0, section: str = None):
+        self.id = id
+        self.title = title
+        self.type = type
+        self.required = required
+        self.options = options
+        self.page = page
+        self.section = section
+
+    def to_dict(self) -> dict:
+        # "name" is the key the mapping and cache code has always used for the title
+        return {
+            "id": self.id,
+            "name": self.title,
+            "type": self.type,
+            "required": self.required,
+            "options": self.options,
+            "page": self.page,
+            "section": self.section,
+        }
+
+    def __repr__(self):
+        return f"FormEntry(id={self.id!r}, title={self.title!r}, type={self.type!r}, page={self.page})"
+
+
+def extract_load_data(html: str):
+    """Decode the `var FB_PUBLIC_LOAD_DATA_ = [...]` literal, or None if the page has none.
+
+    Only the JSON span after the assignment is decoded (raw_decode stops at
+    the end of the array), so semicolons inside question text are harmless.
+    """
+    start = 0
+    while True:
+        index = html.find(LOAD_DATA_VARIABLE, start)
+        if index < 0:
+            return None
+        start = index + len(LOAD_DATA_VARIABLE)
+        assignment = ASSIGNMENT_PATTERN.match(html, start)
+        if assignment is None:
+            continue
+        try:
+            value, _ = _decoder.raw_decode(html, assignment.end())
+            return value
+        except ValueError:
+            continue
+
+
+def entries_from_load_data(form_data) -> list:
+    """FormEntry records for every input, tagged with page number and section title; None if malformed"""
+    try:
+        items = form_data[1][1]
+    except (IndexError, TypeError):
+        return None
+    if not items:
+        return None
+
+    entries = []
+    page = 0
+    section = None
+    for item in items:
+        if not isinstance(item, list) or len(item) < 4:
+            continue
+        if item[3] == SECTION_HEADER_TYPE:
+            page += 1
+            section = item[1]
+            continue
+        # Titles, descriptions, images and videos have no inputs
+        inputs = item[4] if len(item) > 4 else None
+        if not inputs:
+            continue
+        for sub_entry in inputs:
+            entries.append(FormEntry(
+                id=sub_entry[0],
+                title=item[1],
+                type=item[3],
+                required=len(sub_entry) > 2 and sub_entry[2] == 1,
+                options=[option[0] for option in sub_entry[1]] if sub_entry[1] else None,
+                page=page,
+                section=section,
+            ))
+    return entries
+
+
+def parse_form_page(html: str) -> list:
+    """FormEntry records from a viewform page, or None if it carries no form data"""
+    form_data = extract_load_data(html)
+    if form_data is None:
+        return None
+    return entries_from_load_data(form_data)
@@ -1,10 +1,41 @@
 import os
 import json
-import requests
-import re
+import time
 from urllib.parse import quote
+import httpx
 from logger import log_error
-from llama_index.llms.openrouter import OpenRouter
+from config import (
+    FORM_SCHEMA_TTL,
+    FORM_SCHEMA_MAX_AGE,
+    FORM_SCHEMA_CACHE_MAX_ENTRIES,
+    FORM_SCHEMA_CACHE_DISK_MAX_ENTRIES,
+)
+from services.cache import build_cache
+from services.http_client import get_http_client
+from services.field_matcher import get_field_matcher, RESUME_KEYS
+from services.mapping_cache import get_mapping_cache
+from services.llm_gateway import get_llm
+from services.single_flight import SingleFlight
+from services.metrics import span
+from services.job_queue import is_transient_error
+from services.form_schema import extract_load_data, entries_from_load_data
+
+_form_schema_cache = None
+
+def get_form_schema_cache():
+    """Shared form-schema cache keyed by form ID, created on first use"""
+    global _form_schema_cache
+    if _form_schema_cache is None:
+        _form_schema_cache = build_cache(
+            "form_schemas",
+            FORM_SCHEMA_CACHE_MAX_ENTRIES,
+            FORM_SCHEMA_CACHE_DISK_MAX_ENTRIES,
+            FORM_SCHEMA_MAX_AGE
+        )
+    return _form_schema_cache
+
+# Concurrent fetches of the same form share one request
+form_fetch_flights = SingleFlight()
 
 class GoogleFormsService:
     ALL_DATA_FIELDS = "FB_PUBLIC_LOAD_DATA_"
@@ -13,15 +44,10 @@ class GoogleFormsService:
         self.openrouter_key = os.getenv("OPENROUTER_API_KEY")
         self.form_data = None
         self.entries = None
+        self.on_progress = None
         
-        # Initialize OpenRouter LLM for field mapping
-        if self.openrouter_key:
-            self.llm = OpenRouter(
-                api_key=self.openrouter_key,
-                model="mistralai/mistral-7b-instruct:free",
-                max_tokens=1000,
-                temperature=0.1
-            )
+        # Shared OpenRouter gateway for field mapping (None without an API key)
+        self.llm = get_llm(max_tokens=1000, temperature=0.1)
         
 
     
@@ -57,19 +83,29 @@ class GoogleFormsService:
             {"type": "text", "label": "Education"}
         ]
     
-    async def submit_form_response(self, form_url: str, resume_data: dict) -> dict:
+    async def get_form_entries(self, form_url: str):
+        """Fetch (or reuse the cached) parsed entries for a form"""
+        return await self._parse_form_entries(form_url)
+    
+    async def submit_form_response(self, form_url: str, resume_data: dict, on_progress=None) -> dict:
         """Submit form response using reference repo approach"""
+        self.on_progress = on_progress
         try:
             # Parse form entries from the URL
-            entries = self._parse_form_entries(form_url)
+            self._report("schema_fetch")
+            entries = await self._parse_form_entries(form_url)
             if not entries:
                 return {"success": False, "error": "Could not parse form entries"}
             
             # Fill entries with resume data
-            filled_data = self._fill_entries_with_resume_data(entries, resume_data)
+            self._report("mapping")
+            with span("forms.mapping"):
+                filled_data = await self._fill_entries_with_resume_data(entries, resume_data)
             
             # Submit the form
-            success = self._submit_form(form_url, filled_data)
+            self._report("submit")
+            with span("forms.submit"):
+                success, retryable = await self._submit_form(form_url, filled_data)
             
             if success:
                 return {
@@ -78,14 +114,18 @@ class GoogleFormsService:
                     "message": f"Form submitted successfully with {len(filled_data)} fields"
                 }
             else:
-                return {"success": False, "error": "Form submission failed"}
+                return {"success": False, "error": "Form submission failed", "retryable": retryable}
                     
         except Exception as e:
             log_error(f"Form submission failed: {e}", "google-forms")
-            return {"success": False, "error": str(e)}
+            return {"success": False, "error": str(e), "retryable": is_transient_error(e)}
     
 
     
+    def _report(self, stage: str):
+        if self.on_progress:
+            self.on_progress(stage)
+    
     def _get_form_response_url(self, url: str) -> str:
         """Convert form URL to form response URL"""
         url = url.replace('/viewform', '/formResponse')
@@ -95,103 +135,203 @@ class GoogleFormsService:
             url += 'formResponse'
         return url
     
-    def _extract_script_variables(self, name: str, html: str):
-        """Extract a variable from a script tag in a HTML page"""
-        pattern = re.compile(r'var\s' + name + r'\s=\s(.*?);')
-        match = pattern.search(html)
-        if not match:
-            return None
-        value_str = match.group(1)
-        return json.loads(value_str)
-    
-    def _get_fb_public_load_data(self, url: str):
+    async def _get_fb_public_load_data(self, url: str, headers: dict = None):
         """Get form data from a Google form URL"""
-        response = requests.get(url, timeout=10)
+        response = await get_http_client().get(url, headers=headers)
+        if response.status_code == 304:
+            return response, None
+        if response.status_code == 429 or response.status_code >= 500:
+            # Raise so a cached schema is served, or the job is retried later
+            response.raise_for_status()
         if response.status_code != 200:
             log_error(f"Can't get form data: {response.status_code}", "google-forms")
-            return None
-        return self._extract_script_variables(self.ALL_DATA_FIELDS, response.text)
+            return response, None
+        return response, extract_load_data(response.text)
+    
+    async def _parse_form_entries(self, url: str):
+        """Parse the form entries and return a list of entries, reusing cached schemas"""
+        form_id = self.extract_form_id(url)
+        return await form_fetch_flights.do(form_id or url, self._parse_form_entries_uncached, url, form_id)
     
-    def _parse_form_entries(self, url: str):
-        """Parse the form entries and return a list of entries"""
-        self.form_data = self._get_fb_public_load_data(url)
+    async def _parse_form_entries_uncached(self, url: str, form_id: str):
+        cache = get_form_schema_cache()
+        cached = cache.get(form_id) if form_id else None
         
-        if not self.form_data or not self.form_data[1] or not self.form_data[1][1]:
-            log_error("Can't get form entries", "google-forms")
-            return None
+        if cached and time.time() - cached["fetched_at"] < FORM_SCHEMA_TTL:
+            return cached["entries"]
         
-        parsed_entries = []
-        for entry in self.form_data[1][1]:
-            if entry[3] == 8:  # Skip session type entries
-                continue
-            
-            entry_name = entry[1]
-            for sub_entry in entry[4]:
-                info = {
-                    "id": sub_entry[0],
-                    "name": entry_name,
-                    "type": entry[3],
-                    "required": sub_entry[2] == 1,
-                    "options": [x[0] for x in sub_entry[1]] if sub_entry[1] else None,
-                }
-                parsed_entries.append(info)
+        # Revalidate a stale schema instead of downloading it again
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        
+        try:
+            with span("forms.schema_fetch"):
+                response, self.form_data = await self._get_fb_public_load_data(url, headers)
+        except Exception as e:
+            if not cached:
+                raise
+            log_error(f"Form fetch failed, using cached schema: {e}", "google-forms")
+            return cached["entries"]
+        
+        if cached and response.status_code == 304:
+            cached["fetched_at"] = time.time()
+            cache.set(form_id, cached)
+            return cached["entries"]
+        
+        parsed_entries = self._entries_from_form_data(self.form_data)
+        if parsed_entries is None:
+            # Keep serving the last good schema if the page could not be parsed
+            return cached["entries"] if cached else None
         
+        if form_id:
+            cache.set(form_id, {
+                "entries": parsed_entries,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time()
+            })
         return parsed_entries
     
-    def _fill_entries_with_resume_data(self, entries, resume_data):
-        """Fill form entries with resume data"""
+    def _entries_from_form_data(self, form_data):
+        """Convert FB_PUBLIC_LOAD_DATA_ into a list of entry dicts (the cached form)"""
+        entries = entries_from_load_data(form_data) if form_data else None
+        if not entries:
+            log_error("Can't get form entries", "google-forms")
+            return None
+        return [entry.to_dict() for entry in entries]
+    
+    async def resume_keys_for_form(self, form_url: str):
+        """Resume keys the form's questions map to without the LLM, or None if any question needs it"""
+        try:
+            entries = await self._parse_form_entries(form_url)
+        except Exception as e:
+            log_error(f"Could not fetch form to plan parsing: {e}", "google-forms")
+            return None
+        if not entries:
+            return None
+        
+        keys = set()
+        for entry in entries:
+            resolved, resume_key = self._local_resume_key(entry)
+            if not resolved:
+                return None
+            if resume_key:
+                keys.add(resume_key)
+        return keys
+    
+    def _local_resume_key(self, entry) -> tuple:
+        """(resolved, resume key) from the matcher or an earlier LLM decision for the same question"""
+        matcher = get_field_matcher()
+        resume_key, confidence = matcher.match(entry['name'], entry['type'])
+        if matcher.is_confident(confidence):
+            return True, resume_key
+        cached = get_mapping_cache().get(entry['name'], entry['type'])
+        if cached is None:
+            return False, None
+        return True, cached[0]
+    
+    async def _fill_entries_with_resume_data(self, entries, resume_data):
+        """Fill form entries with resume data, asking the LLM only about low-confidence entries"""
         filled_data = {}
+        unresolved = []
         
         for entry in entries:
-            entry_id = f"entry.{entry['id']}"
-            entry_name = entry['name'].lower()
-            
-            value = None
-            if any(word in entry_name for word in ['name', 'full name']):
-                value = resume_data.get('Full Name')
-            elif any(word in entry_name for word in ['email', 'mail']):
-                value = resume_data.get('Email')
-            elif any(word in entry_name for word in ['phone', 'mobile', 'contact']):
-                value = resume_data.get('Phone Number')
-            elif any(word in entry_name for word in ['skill', 'technology']):
-                value = resume_data.get('Skills')
-            elif any(word in entry_name for word in ['education', 'degree']):
-                value = resume_data.get('Education')
-            elif any(word in entry_name for word in ['experience', 'work', 'job']):
-                value = resume_data.get('Work Experience')
+            resolved, resume_key = self._local_resume_key(entry)
+            if not resolved:
+                unresolved.append(entry)
+                continue
             
-            if value:
-                filled_data[entry_id] = str(value)
+            answer = self._entry_answer(entry, resume_data.get(resume_key) if resume_key else None)
+            if answer:
+                filled_data[f"entry.{entry['id']}"] = answer
+        
+        if unresolved and self.llm:
+            ai_keys = await self._map_entries_with_ai(unresolved, resume_data)
+            for entry in unresolved:
+                answer = self._entry_answer(entry, resume_data.get(ai_keys.get(entry['id'])))
+                if answer:
+                    filled_data[f"entry.{entry['id']}"] = answer
         
         return filled_data
     
-    def _submit_form(self, url: str, data: dict) -> bool:
-        """Submit the form with data"""
+    def _entry_answer(self, entry, value):
+        """Text to submit for an entry; choice questions only take a value naming one of their options"""
+        if not value:
+            return None
+        if not entry.get('options'):
+            return str(value)
+        text = str(value).strip().lower()
+        for option in entry['options']:
+            if option and str(option).strip().lower() == text:
+                return option
+        return None
+    
+    async def _map_entries_with_ai(self, entries, resume_data) -> dict:
+        """Ask the LLM which resume key answers each entry; returns {entry id: resume key}.
+
+        The decision is about the question, not this resume, so the LLM picks
+        from every resume key and its answer is cached for all later candidates.
+        """
+        questions = [{"id": entry['id'], "question": entry['name']} for entry in entries]
+        prompt = f"""
+Map each form question to the resume field that answers it.
+
+Resume fields: {json.dumps(list(RESUME_KEYS))}
+
+Questions:
+{json.dumps(questions, indent=2)}
+
+Return a JSON object mapping each question id to a resume field name, or null if none fits.
+Return valid JSON only.
+"""
+        try:
+            with span("forms.llm"):
+                response = await self.llm.acomplete(prompt)
+            content = str(response)
+            
+            # Clean and parse JSON
+            if '```json' in content:
+                content = content.split('```json')[1].split('```')[0]
+            elif '```' in content:
+                content = content.split('```')[1].split('```')[0]
+            
+            mapping = {int(entry_id): key for entry_id, key in json.loads(content.strip()).items()}
+            ai_keys = {entry_id: key for entry_id, key in mapping.items() if key in RESUME_KEYS}
+            
+            # Remember the answers, including "no resume field fits", for the questions the LLM answered
+            mapping_cache = get_mapping_cache()
+            for entry in entries:
+                if entry['id'] not in mapping:
+                    continue
+                resume_key = ai_keys.get(entry['id'])
+                mapping_cache.set(entry['name'], entry['type'], resume_key, 0.8 if resume_key else 0.0)
+            return ai_keys
+        except Exception as e:
+            log_error(f"AI entry mapping failed: {e}", "google-forms")
+            return {}
+    
+    async def _submit_form(self, url: str, data: dict) -> tuple:
+        """Submit the form with data; returns (success, safe to retry)"""
         submit_url = self._get_form_response_url(url)
         
         try:
-            response = requests.post(submit_url, data=data, timeout=10)
-            return response.status_code == 200
+            response = await get_http_client().post(submit_url, data=data)
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+            # The request never reached Google, so resending cannot submit twice
+            log_error(f"Form submission error: {e}", "google-forms")
+            return False, True
         except Exception as e:
             log_error(f"Form submission error: {e}", "google-forms")
-            return False
+            return False, False
+        # 429 and 503 mean the response was not recorded
+        return response.status_code == 200, response.status_code in (429, 503)
     
     def _map_question_to_resume(self, title: str, resume_data: dict) -> str:
         """Map form question to resume data"""
-        title_lower = title.lower()
-        
-        if any(word in title_lower for word in ['name', 'full name']):
-            return resume_data.get('Full Name', '')
-        elif any(word in title_lower for word in ['email', 'mail']):
-            return resume_data.get('Email', '')
-        elif any(word in title_lower for word in ['phone', 'mobile', 'contact']):
-            return resume_data.get('Phone Number', '')
-        elif any(word in title_lower for word in ['skill', 'technology']):
-            return resume_data.get('Skills', '')
-        elif any(word in title_lower for word in ['education', 'degree']):
-            return resume_data.get('Education', '')
-        elif any(word in title_lower for word in ['experience', 'work', 'job']):
-            return resume_data.get('Work Experience', '')
-        
+        resume_key, confidence = get_field_matcher().match(title)
+        if resume_key and get_field_matcher().is_confident(confidence):
+            return resume_data.get(resume_key, '')
         return ''
-    
@@ -0,0 +1,170 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+import httpx
+from services.llm_gateway import RetryableLLMError, LLMUnavailable
+from services.cache import connect_sqlite
+from config import JOB_QUEUE, JOB_QUEUE_PATH, JOB_QUEUE_MAX_DEPTH, JOB_LEASE_SECONDS, JOB_RETENTION
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFull(Exception):
+    """The queue already holds max_depth queued or running jobs"""
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Upstream failures (network, rate limits, 5xx, LLM outages) that a later retry may get past"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, RetryableLLMError, LLMUnavailable, TimeoutError))
+
+
+class SQLiteJobQueue:
+    """Durable FIFO job queue in one SQLite file, shared by the API and worker processes.
+
+    A worker claims a job by leasing it and renews the lease while it runs;
+    a job whose lease runs out (its worker died) is handed out again.
+    Methods block on SQLite; async callers run them with asyncio.to_thread.
+    """
+
+    def __init__(self, path: str, max_depth: int = 100, lease_seconds: float = 300, retention: float = 86400):
+        self.path = path
+        self.max_depth = max_depth
+        self.lease_seconds = lease_seconds
+        self.retention = retention
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = connect_sqlite(path, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id INTEGER PRIMARY KEY AUTOINCREMENT, task_id TEXT NOT NULL, "
+                "kind TEXT NOT NULL, payload TEXT NOT NULL, status TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, available_at REAL NOT NULL, "
+                "leased_until REAL, worker TEXT, last_error TEXT, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_available ON jobs (status, available_at)")
+
+    @contextmanager
+    def _connect(self):
+        with self._lock:
+            yield self._conn
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so concurrent claims never hand out one job twice
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def enqueue(self, task_id: str, kind: str, payload: dict) -> int:
+        """Add a job; raises QueueFull when max_depth jobs are already queued or running"""
+        now = time.time()
+        with self._transaction() as conn:
+            depth = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchone()[0]
+            if depth >= self.max_depth:
+                raise QueueFull(f"Job queue is full ({depth} jobs waiting or running)")
+            cursor = conn.execute(
+                "INSERT INTO jobs (task_id, kind, payload, status, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (task_id, kind, json.dumps(payload), QUEUED, now, now, now)
+            )
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (DONE, FAILED, now - self.retention)
+            )
+            return cursor.lastrowid
+
+    def claim(self, worker: str):
+        """Lease the oldest runnable job to `worker`, or return None if there is none"""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT job_id, task_id, kind, payload, attempts FROM jobs "
+                "WHERE (status = ? AND available_at <= ?) OR (status = ? AND leased_until < ?) "
+                "ORDER BY available_at, job_id LIMIT 1",
+                (QUEUED, now, RUNNING, now)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, task_id, kind, payload, attempts = row
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = ?, leased_until = ?, worker = ?, updated_at = ? "
+                "WHERE job_id = ?",
+                (RUNNING, attempts + 1, now + self.lease_seconds, worker, now, job_id)
+            )
+        return {"job_id": job_id, "task_id": task_id, "kind": kind, "payload": json.loads(payload), "attempts": attempts + 1}
+
+    def renew(self, job_id: int, worker: str) -> bool:
+        """Extend a running job's lease; False if the job is no longer leased to `worker`"""
+        now = time.time()
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET leased_until = ?, updated_at = ? WHERE job_id = ? AND worker = ? AND status = ?",
+                (now + self.lease_seconds, now, job_id, worker, RUNNING)
+            ).rowcount == 1
+
+    def complete(self, job_id: int):
+        self._finish(job_id, DONE, None)
+
+    def fail(self, job_id: int, error: str):
+        self._finish(job_id, FAILED, error)
+
+    def retry(self, job_id: int, error: str, delay: float):
+        """Put a job back in the queue, runnable again after `delay` seconds"""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, leased_until = NULL, last_error = ?, updated_at = ? "
+                "WHERE job_id = ?",
+                (QUEUED, now + delay, error, now, job_id)
+            )
+
+    def _finish(self, job_id: int, status: str, error: str):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, leased_until = NULL, last_error = ?, updated_at = ? WHERE job_id = ?",
+                (status, error, time.time(), job_id)
+            )
+
+    def depth(self) -> int:
+        """Jobs counted against max_depth: queued (including waiting to retry) or running"""
+        return sum(count for status, count in self.stats_by_status().items() if status in (QUEUED, RUNNING))
+
+    def stats_by_status(self) -> dict:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def stats(self) -> dict:
+        counts = self.stats_by_status()
+        return {
+            "max_depth": self.max_depth,
+            **{status: counts.get(status, 0) for status in (QUEUED, RUNNING, DONE, FAILED)},
+        }
+
+
+_job_queue = None
+
+def get_job_queue():
+    """Shared job queue when JOB_QUEUE=sqlite, or None when jobs run inline in the web process"""
+    global _job_queue
+    if _job_queue is None and JOB_QUEUE == "sqlite":
+        _job_queue = SQLiteJobQueue(JOB_QUEUE_PATH, JOB_QUEUE_MAX_DEPTH, JOB_LEASE_SECONDS, JOB_RETENTION)
+    return _job_queue
@@ -0,0 +1,276 @@
+import os
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+import httpx
+from logger import log_error
+from services.http_client import get_http_client
+from services.metrics import Histogram
+from config import (
+    FREE_MODELS,
+    OPENROUTER_BASE_URL,
+    REQUIRED_HEADERS,
+    LLM_MAX_CONCURRENCY,
+    LLM_RATE_PER_MINUTE,
+    LLM_RATE_BURST,
+    LLM_QUEUE_TIMEOUT,
+    LLM_HEDGE_DELAY,
+    LLM_TIMEOUT,
+)
+
+# Upstream statuses worth trying the next model for
+RETRYABLE_STATUSES = {404, 408, 429}
+
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds", "OpenRouter call latency by model and outcome", ("model", "outcome")
+)
+
+
+class LLMError(Exception):
+    """An LLM call failed in a way another model will not fix"""
+
+
+class RetryableLLMError(LLMError):
+    """An LLM call failed for this model (rate limit, outage, timeout); try the next one"""
+
+
+class LLMUnavailable(LLMError):
+    """No model could answer, or the local rate limit queue is full"""
+
+
+class TokenBucket:
+    """Token bucket: `rate` tokens per second, bursts up to `capacity`.
+
+    Callers reserve a token up front (the balance may go negative), so each
+    one learns its place in line immediately instead of queueing on a lock.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, max_wait: float = None) -> float:
+        """Take the next token and return how long until it is due; raises if that is beyond max_wait"""
+        self._refill()
+        wait = max(0.0, (1 - self.tokens) / self.rate)
+        if max_wait is not None and wait > max_wait:
+            raise LLMUnavailable(f"LLM rate limit queue full (next slot in {wait:.1f}s)")
+        self.tokens -= 1
+        return wait
+
+    async def acquire(self, max_wait: float = None):
+        wait = self.reserve(max_wait)
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # Hand the reserved slot back to the callers queued behind this one
+                self.tokens += 1
+                raise
+
+
+class ModelStats:
+    def __init__(self, window: int = 200):
+        self.calls = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=window)
+
+    def snapshot(self) -> dict:
+        ordered = sorted(self.latencies)
+
+        def percentile(p):
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 1)
+
+        return {"calls": self.calls, "errors": self.errors, "p50_ms": percentile(0.5), "p95_ms": percentile(0.95)}
+
+
+class LLMGateway:
+    """App-lifetime OpenRouter client shared by every service.
+
+    Calls reuse the pooled HTTP client, are bounded by a global concurrency
+    semaphore and a token bucket sized to the free-tier quota, and fail over
+    through FREE_MODELS on rate limits, 5xx and timeouts. If a model has not
+    answered within hedge_delay seconds the next model is raced against it.
+    """
+
+    def __init__(self, api_key: str, models: list, max_concurrency: int = 4, rate_per_minute: float = 20,
+                 burst: float = 5, queue_timeout: float = 30, hedge_delay: float = 0, timeout: float = 60):
+        self.api_key = api_key
+        self.models = models
+        self.queue_timeout = queue_timeout
+        self.hedge_delay = hedge_delay
+        self.timeout = timeout
+        self.stats_by_model = {model: ModelStats() for model in models}
+        self.max_concurrency = max_concurrency
+        self.waiting = 0
+        self.active = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bucket = TokenBucket(rate_per_minute / 60.0, burst)
+
+    async def complete(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.1) -> str:
+        pending = set()
+        errors = []
+        next_model = 0
+
+        def launch():
+            nonlocal next_model
+            model = self.models[next_model]
+            next_model += 1
+            pending.add(asyncio.create_task(self._call_model(model, prompt, max_tokens, temperature)))
+
+        launch()
+        try:
+            while pending:
+                can_hedge = self.hedge_delay and next_model < len(self.models)
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    launch()
+                    continue
+
+                for task in done:
+                    pending.discard(task)
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    # A hedge that could not get a slot in time leaves the call already in flight to finish
+                    if isinstance(error, LLMUnavailable) and pending:
+                        errors.append(str(error))
+                        continue
+                    if not isinstance(error, RetryableLLMError):
+                        raise error
+                    errors.append(str(error))
+
+                if not pending and next_model < len(self.models):
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise LLMUnavailable(f"All models failed: {'; '.join(errors)}")
+
+    @asynccontextmanager
+    async def _slot(self):
+        """Concurrency slot and rate-limit token, within queue_timeout seconds of asking for them"""
+        deadline = time.monotonic() + self.queue_timeout
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise LLMUnavailable(f"LLM concurrency queue full (no slot within {self.queue_timeout:.0f}s)") from None
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            await self._bucket.acquire(max(0.0, deadline - time.monotonic()))
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    async def _call_model(self, model: str, prompt: str, max_tokens: int, temperature: float) -> str:
+        stats = self.stats_by_model[model]
+        async with self._slot():
+            stats.calls += 1
+            started = time.perf_counter()
+            try:
+                response = await get_http_client().post(
+                    OPENROUTER_BASE_URL,
+                    headers={"Authorization": f"Bearer {self.api_key}", **REQUIRED_HEADERS},
+                    json={
+                        "model": model,
+                        "messages": [{"role": "user", "content": prompt}],
+                        "max_tokens": max_tokens,
+                        "temperature": temperature
+                    },
+                    timeout=self.timeout
+                )
+            except httpx.HTTPError as e:
+                elapsed = time.perf_counter() - started
+                stats.errors += 1
+                stats.latencies.append(elapsed)
+                LLM_REQUEST_DURATION.observe(elapsed, model, "transport_error")
+                raise RetryableLLMError(f"{model}: {type(e).__name__}") from e
+            # Hedged calls cancelled by a faster model never get here, so they don't skew latency
+            elapsed = time.perf_counter() - started
+            stats.latencies.append(elapsed)
+            LLM_REQUEST_DURATION.observe(elapsed, model, str(response.status_code))
+
+        if response.status_code in RETRYABLE_STATUSES or response.status_code >= 500:
+            stats.errors += 1
+            raise RetryableLLMError(f"{model}: HTTP {response.status_code}")
+        if response.status_code != 200:
+            stats.errors += 1
+            raise LLMError(f"{model}: HTTP {response.status_code} {response.text[:200]}")
+
+        try:
+            content = response.json()["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            stats.errors += 1
+            raise RetryableLLMError(f"{model}: malformed response") from e
+        if not content or not content.strip():
+            stats.errors += 1
+            raise RetryableLLMError(f"{model}: empty response")
+        return content
+
+    def stats(self) -> dict:
+        return {model: stats.snapshot() for model, stats in self.stats_by_model.items()}
+
+    def queue_stats(self) -> dict:
+        return {"max_concurrency": self.max_concurrency, "waiting": self.waiting, "active": self.active}
+
+
+class LLMClient:
+    """Per-call-site generation settings bound to the shared gateway"""
+
+    def __init__(self, gateway: LLMGateway, max_tokens: int, temperature: float):
+        self.gateway = gateway
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+
+    async def acomplete(self, prompt: str) -> str:
+        try:
+            return await self.gateway.complete(prompt, self.max_tokens, self.temperature)
+        except LLMError as e:
+            log_error(str(e), "llm-gateway")
+            raise
+
+
+_gateway = None
+
+def get_llm_gateway():
+    """Shared gateway, or None when OPENROUTER_API_KEY is not set"""
+    global _gateway
+    if _gateway is None:
+        api_key = os.getenv("OPENROUTER_API_KEY")
+        if not api_key:
+            return None
+        _gateway = LLMGateway(
+            api_key,
+            list(FREE_MODELS.values()),
+            max_concurrency=LLM_MAX_CONCURRENCY,
+            rate_per_minute=LLM_RATE_PER_MINUTE,
+            burst=LLM_RATE_BURST,
+            queue_timeout=LLM_QUEUE_TIMEOUT,
+            hedge_delay=LLM_HEDGE_DELAY,
+            timeout=LLM_TIMEOUT
+        )
+    return _gateway
+
+def get_llm(max_tokens: int = 1000, temperature: float = 0.1):
+    """LLM client for a service, or None when no API key is configured"""
+    gateway = get_llm_gateway()
+    return LLMClient(gateway, max_tokens, temperature) if gateway else None
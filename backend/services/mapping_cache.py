@@ -0,0 +1,101 @@
+from config import (
+    FIELD_MAPPING_CACHE_MAX_ENTRIES,
+    FIELD_MAPPING_CACHE_DISK_MAX_ENTRIES,
+    FIELD_MAPPING_CACHE_TTL,
+)
+from services.cache import build_cache
+from services.field_matcher import normalize, RESUME_KEYS
+
+EXPORT_VERSION = 1
+
+
+class FieldMappingCache:
+    """Remembers which resume key answers a question, keyed by normalized label and field type.
+
+    A cached resume_key of None records that no resume field fits, so the
+    question is not sent to the LLM again either.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def _key(self, label: str, field_type) -> tuple:
+        normalized = " ".join(normalize(label or ""))
+        return f"{field_type}|{normalized}", normalized
+
+    def get(self, label: str, field_type=None):
+        """Return (resume_key, confidence) or None when the label has not been seen"""
+        key, _ = self._key(label, field_type)
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        return entry["resume_key"], entry["confidence"]
+
+    def set(self, label: str, field_type, resume_key: str, confidence: float) -> bool:
+        """Remember a mapping; False (nothing stored) when the label normalizes to nothing"""
+        key, normalized = self._key(label, field_type)
+        if not normalized:
+            return False
+        self.cache.set(key, {
+            "label": normalized,
+            "field_type": field_type,
+            "resume_key": resume_key,
+            "confidence": confidence
+        })
+        return True
+
+    def export(self) -> dict:
+        return {"version": EXPORT_VERSION, "entries": [entry for _, entry in self.cache.items()]}
+
+    def import_entries(self, data: dict) -> dict:
+        """Load entries produced by export(); returns how many were stored and how many were skipped.
+
+        Entries with an unknown resume_key, a confidence outside [0, 1] or an
+        empty label are skipped, since imported mappings answer forms unchecked.
+        """
+        if data.get("version") != EXPORT_VERSION:
+            raise ValueError(f"Unsupported field mapping export version: {data.get('version')}")
+        entries = data.get("entries", [])
+        if not isinstance(entries, list):
+            raise ValueError("entries must be a list")
+        imported = 0
+        for entry in entries:
+            if _valid_entry(entry) and self.set(
+                entry["label"], entry.get("field_type"), entry.get("resume_key"), float(entry.get("confidence", 0.0))
+            ):
+                imported += 1
+        return {"imported": imported, "skipped": len(entries) - imported}
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+
+def _valid_entry(entry) -> bool:
+    if not isinstance(entry, dict) or not isinstance(entry.get("label"), str):
+        return False
+    field_type = entry.get("field_type")
+    if field_type is not None and not isinstance(field_type, str):
+        return False
+    # None records that no resume field fits the question
+    resume_key = entry.get("resume_key")
+    if resume_key is not None and resume_key not in RESUME_KEYS:
+        return False
+    confidence = entry.get("confidence", 0.0)
+    if isinstance(confidence, bool) or not isinstance(confidence, (int, float)):
+        return False
+    return 0.0 <= confidence <= 1.0
+
+
+_mapping_cache = None
+
+def get_mapping_cache() -> FieldMappingCache:
+    """Shared field-mapping memo, created on first use"""
+    global _mapping_cache
+    if _mapping_cache is None:
+        _mapping_cache = FieldMappingCache(build_cache(
+            "field_mappings",
+            FIELD_MAPPING_CACHE_MAX_ENTRIES,
+            FIELD_MAPPING_CACHE_DISK_MAX_ENTRIES,
+            FIELD_MAPPING_CACHE_TTL
+        ))
+    return _mapping_cache
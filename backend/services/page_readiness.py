@@ -0,0 +1,110 @@
+import time
+from contextlib import contextmanager
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from config import (
+    READY_PAGE_TIMEOUT,
+    READY_FIELD_TIMEOUT,
+    READY_SUBMIT_TIMEOUT,
+    READY_POLL_INTERVAL,
+    NETWORK_IDLE_QUIET,
+)
+
+FORM_INPUTS_XPATH = "//input | //textarea | //div[@role='textbox']"
+CONFIRMATION_XPATH = "//*[contains(text(), 'response has been recorded')]"
+
+
+class FillTimer:
+    """Splits wall time for one form into idle (waiting) and active (page work) time"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.waits = []
+
+    @contextmanager
+    def idle(self, label: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.waits.append((label, time.perf_counter() - start))
+
+    def report(self) -> dict:
+        total = time.perf_counter() - self.started
+        idle = sum(duration for _, duration in self.waits)
+        by_label = {}
+        for label, duration in self.waits:
+            by_label[label] = by_label.get(label, 0.0) + duration
+        return {
+            "total_ms": round(total * 1000, 1),
+            "idle_ms": round(idle * 1000, 1),
+            "active_ms": round((total - idle) * 1000, 1),
+            "waits": {label: round(duration * 1000, 1) for label, duration in by_label.items()},
+        }
+
+
+class PageReadiness:
+    """Explicit condition waits with upper bounds, in place of fixed sleeps.
+
+    Every wait returns as soon as its condition holds and reports False on
+    timeout instead of raising, so callers decide whether to carry on.
+    """
+
+    def __init__(self, driver, timer: FillTimer = None):
+        self.driver = driver
+        self.timer = timer or FillTimer()
+
+    def _until(self, label: str, timeout: float, condition) -> bool:
+        with self.timer.idle(label):
+            try:
+                WebDriverWait(self.driver, timeout, poll_frequency=READY_POLL_INTERVAL).until(condition)
+                return True
+            except TimeoutException:
+                return False
+
+    def document_ready(self) -> bool:
+        return self._until(
+            "document_ready", READY_PAGE_TIMEOUT,
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+
+    def form_ready(self) -> bool:
+        return self._until(
+            "form_ready", READY_PAGE_TIMEOUT,
+            EC.element_to_be_clickable((By.XPATH, FORM_INPUTS_XPATH))
+        )
+
+    def interactable(self, element) -> bool:
+        return self._until("interactable", READY_FIELD_TIMEOUT, EC.element_to_be_clickable(element))
+
+    def value_committed(self, element, value: str) -> bool:
+        expected = str(value)
+        return self._until(
+            "value_committed", READY_FIELD_TIMEOUT,
+            lambda d: expected in (element.get_attribute('value') or element.text or '')
+        )
+
+    def network_idle(self) -> bool:
+        """Wait until no new resource requests start for NETWORK_IDLE_QUIET seconds"""
+        state = {"count": -1, "since": time.perf_counter()}
+
+        def settled(driver):
+            count = driver.execute_script("return performance.getEntriesByType('resource').length")
+            now = time.perf_counter()
+            if count != state["count"]:
+                state["count"] = count
+                state["since"] = now
+                return False
+            return now - state["since"] >= NETWORK_IDLE_QUIET
+
+        return self._until("network_idle", READY_PAGE_TIMEOUT, settled)
+
+    def submission_confirmed(self, previous_url: str) -> bool:
+        return self._until(
+            "submission_confirmed", READY_SUBMIT_TIMEOUT,
+            lambda d: 'formResponse' in d.current_url
+            or d.current_url != previous_url
+            or d.find_elements(By.XPATH, CONFIRMATION_XPATH)
+        )
@@ -0,0 +1,87 @@
+import json
+import asyncio
+from config import PROGRESS_POLL_INTERVAL
+from services.task_store import get_task_store, FINISHED_STATUSES
+
+# Fine-grained stages emitted while a fill task runs: (progress %, message)
+STAGES = {
+    "text_extraction": (10, "Extracting resume text..."),
+    "llm_parse": (40, "Parsing resume with AI..."),
+    "schema_fetch": (60, "Fetching form schema..."),
+    "mapping": (75, "Mapping resume to form fields..."),
+    "submit": (90, "Submitting form..."),
+}
+
+
+class ProgressBroker:
+    """In-process fan-out of task state changes to streaming subscribers"""
+
+    def __init__(self):
+        self._subscribers = {}
+
+    def subscribe(self, task_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(task_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, task_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(task_id)
+        if queues:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[task_id]
+
+    def publish(self, task_id: str, state: dict):
+        for queue in self._subscribers.get(task_id, ()):
+            queue.put_nowait(state)
+
+    def stats(self) -> dict:
+        return {
+            "tasks": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+        }
+
+
+_broker = ProgressBroker()
+
+def get_progress_broker() -> ProgressBroker:
+    return _broker
+
+def update_task(task_id: str, state: dict):
+    """Persist a task state and push it to anyone streaming this task"""
+    get_task_store().set(task_id, state)
+    _broker.publish(task_id, state)
+
+def stage_reporter(task_id: str):
+    """Build an on_progress callback that records named STAGES for a task"""
+    def report(stage: str):
+        progress, message = STAGES[stage]
+        update_task(task_id, {"status": "processing", "progress": progress, "stage": stage, "message": message})
+    return report
+
+async def watch_task(task_id: str):
+    """Yield task states as they change until the task finishes.
+
+    Updates published in this process arrive immediately; the store is
+    re-read every PROGRESS_POLL_INTERVAL seconds to pick up tasks run by
+    other worker processes.
+    """
+    store = get_task_store()
+    queue = _broker.subscribe(task_id)
+    try:
+        state = store.get(task_id)
+        last_sent = None
+        while state is not None:
+            # Batches are updated in place, so compare serialized snapshots
+            snapshot = json.dumps(state, sort_keys=True, default=str)
+            if snapshot != last_sent:
+                yield state
+                last_sent = snapshot
+            if state.get("status") in FINISHED_STATUSES:
+                return
+            try:
+                state = await asyncio.wait_for(queue.get(), PROGRESS_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                state = store.get(task_id)
+    finally:
+        _broker.unsubscribe(task_id, queue)
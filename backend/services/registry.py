@@ -0,0 +1,51 @@
+import time
+import importlib
+
+# Heavy dependencies and the services built on them, as "module" or "module:attribute".
+# Nothing here is imported until load() asks for it (or warm() runs at startup)
+LAZY_IMPORTS = {
+    "llama_parse": "llama_parse:LlamaParse",
+    "pdf_reader": "PyPDF2:PdfReader",
+    "docx_document": "docx:Document",
+    "webdriver": "selenium.webdriver",
+    "form_analyzer": "services.form_analyzer:FormAnalyzer",
+    "form_filler": "services.form_filler:FormFiller",
+}
+
+_loaded = {}
+# Seconds each entry took to import the first time it was loaded in this process
+load_seconds = {}
+
+
+def register(name: str, target: str):
+    """Add (or replace) a lazily imported dependency"""
+    LAZY_IMPORTS[name] = target
+    _loaded.pop(name, None)
+
+
+def load(name: str):
+    """The module or attribute registered under `name`, importing it on first use"""
+    try:
+        return _loaded[name]
+    except KeyError:
+        pass
+    module_name, _, attribute = LAZY_IMPORTS[name].partition(":")
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    value = getattr(module, attribute) if attribute else module
+    load_seconds.setdefault(name, time.perf_counter() - started)
+    _loaded[name] = value
+    return value
+
+
+def warm(names=None):
+    """Import the named entries (all of them by default) ahead of the first request"""
+    for name in names or list(LAZY_IMPORTS):
+        load(name)
+
+
+def import_report() -> dict:
+    return {
+        "loaded_ms": {name: round(seconds * 1000, 1) for name, seconds in load_seconds.items()},
+        "not_loaded": [name for name in LAZY_IMPORTS if name not in _loaded],
+    }
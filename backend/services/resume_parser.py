@@ -1,87 +1,192 @@
 import os
 import asyncio
 import json
-from PyPDF2 import PdfReader
-from docx import Document
-import io
-from logger import log_resume_data, log_error
+from logger import logger, log_resume_data, log_error
+from config import (
+    FREE_MODELS,
+    RESUME_PARSER_VERSION,
+    RESUME_CACHE_MAX_ENTRIES,
+    RESUME_CACHE_DISK_MAX_ENTRIES,
+    RESUME_CACHE_TTL,
+    PARSE_MODE,
+    TEXT_QUALITY_THRESHOLD,
+)
+from services.cache import build_cache
+from services.executor import run_in_worker
+from services.llm_gateway import get_llm
+from services.single_flight import SingleFlight
+from services.metrics import span
+from services.uploads import StoredUpload, store_bytes
+from services.text_extraction import extract_text, score_text_quality
+from services.resume_rules import score_fields, missing_fields, unsure_fields
+from services.registry import load
 
-# Official LlamaIndex libraries
-from llama_index.llms.openrouter import OpenRouter
-from llama_parse import LlamaParse
-from llama_index.core import Document as LlamaDocument
+_resume_cache = None
+_llama_parser = None
+
+def get_resume_cache():
+    """Shared parsed-resume cache, created on first use"""
+    global _resume_cache
+    if _resume_cache is None:
+        _resume_cache = build_cache(
+            "resumes",
+            RESUME_CACHE_MAX_ENTRIES,
+            RESUME_CACHE_DISK_MAX_ENTRIES,
+            RESUME_CACHE_TTL
+        )
+    return _resume_cache
+
+def get_llama_parser():
+    """Shared LlamaParse client, or None without LLAMA_CLOUD_API_KEY; llama_parse is imported on first use"""
+    global _llama_parser
+    if _llama_parser is None:
+        api_key = os.getenv("LLAMA_CLOUD_API_KEY")
+        if not api_key:
+            return None
+        _llama_parser = load("llama_parse")(
+            api_key=api_key,
+            result_type="text",
+            parsing_instruction="Extract structured information including name, email, phone, address, education, work experience, and skills from this resume document."
+        )
+    return _llama_parser
+
+# Concurrent parses of the same file share one upstream call
+resume_parse_flights = SingleFlight()
+
+# What the LLM is asked to produce for each resume key
+FIELD_DESCRIPTIONS = {
+    "Full Name": "extracted full name",
+    "Email": "extracted email address",
+    "Phone Number": "extracted phone number",
+    "Address": "extracted address",
+    "Education": "education background",
+    "Work Experience": "work experience summary",
+    "Skills": "technical and professional skills",
+}
 
 class ResumeParser:
+    MODEL = FREE_MODELS["primary"]
+
     def __init__(self):
         self.openrouter_key = os.getenv("OPENROUTER_API_KEY")
         self.llama_key = os.getenv("LLAMA_CLOUD_API_KEY")
+        self.used_fallback = False
+        self.partial = False
+        self.required_fields = None
+        self.on_progress = None
         
-        # Initialize OpenRouter LLM
-        if self.openrouter_key:
-            self.llm = OpenRouter(
-                api_key=self.openrouter_key,
-                model="mistralai/mistral-7b-instruct:free",
-                max_tokens=1500,
-                temperature=0.0
-            )
-        
-        # Initialize LlamaParse
-        if self.llama_key:
-            self.parser = LlamaParse(
-                api_key=self.llama_key,
-                result_type="text",
-                parsing_instruction="Extract structured information including name, email, phone, address, education, work experience, and skills from this resume document."
-            )
+        # Shared OpenRouter gateway (None without an API key)
+        self.llm = get_llm(max_tokens=1500, temperature=0.0)
     
-    async def extract_data(self, content: bytes, filename: str) -> dict:
+    @property
+    def parser(self):
+        """Shared LlamaParse client, created (and imported) the first time a file needs it"""
+        return get_llama_parser() if self.llama_key else None
+    
+    async def extract_data(self, content: bytes, filename: str, on_progress=None) -> dict:
+        """Parse in-memory resume bytes; request handlers use extract_upload instead"""
+        with store_bytes(content, filename) as upload:
+            return await self.extract_upload(upload, on_progress)
+
+    async def extract_upload(self, upload: StoredUpload, on_progress=None, fields=None) -> dict:
+        """Parse a resume stored on disk; the caller owns (and cleans up) the file.
+
+        With `fields`, the LLM is skipped when local rules already resolve
+        every one of those resume keys.
+        """
+        # Identical files parse to identical data, so serve repeats from the cache
+        cache = get_resume_cache()
+        cache_key = self._cache_key(upload.sha256, upload.filename)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        self.on_progress = on_progress
+        self.required_fields = set(fields) if fields is not None else None
+        flight_key = cache_key if fields is None else f"{cache_key}:{','.join(sorted(fields))}"
+        result = await resume_parse_flights.do(flight_key, self._extract_and_cache, upload, cache_key)
+        return dict(result)
+
+    async def _extract_and_cache(self, upload: StoredUpload, cache_key: str) -> dict:
+        with span("resume.parse"):
+            result = await self._extract_data_uncached(upload.path, upload.filename)
+
+        # Never cache placeholder data from a failed parse, or a parse limited to some fields
+        if not self.used_fallback and not self.partial:
+            get_resume_cache().set(cache_key, result)
+        return result
+
+    async def _extract_data_uncached(self, path: str, filename: str) -> dict:
+        self.used_fallback = False
+        self.partial = False
+        self._report("text_extraction")
+
+        if PARSE_MODE == "local_first":
+            return await self._extract_local_first(path, filename)
+
         # Try Llama Cloud first with original file
-        llama_result = await self._try_llama_cloud(content, filename)
+        llama_result = await self._try_llama_cloud(path, filename)
         if llama_result:
             return llama_result
             
         # Fallback to text extraction + OpenRouter
-        text = self._extract_text(content, filename)
+        with span("resume.local_extract"):
+            text = await run_in_worker(extract_text, path, filename)
         return await self._parse_with_ai(text)
-    
-    def _extract_text(self, content: bytes, filename: str) -> str:
-        if filename.endswith('.pdf'):
-            return self._extract_pdf_text(content)
-        elif filename.endswith('.docx'):
-            return self._extract_docx_text(content)
-        else:
-            return content.decode('utf-8')
-    
-    def _extract_pdf_text(self, content: bytes) -> str:
-        reader = PdfReader(io.BytesIO(content))
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-        return text
-    
-    def _extract_docx_text(self, content: bytes) -> str:
-        doc = Document(io.BytesIO(content))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+
+    async def _extract_local_first(self, path: str, filename: str) -> dict:
+        """Parse the local text layer, escalating to LlamaParse only when it looks scanned or broken"""
+        try:
+            with span("resume.local_extract"):
+                text = await run_in_worker(extract_text, path, filename)
+        except Exception as e:
+            log_error(f"Local text extraction failed: {e}", "resume-parser")
+            text = ""
+
+        quality = score_text_quality(text)
+        if quality >= TEXT_QUALITY_THRESHOLD or not self.llama_key:
+            return await self._parse_with_ai(text)
+
+        logger.info("Text layer quality %s below %s, escalating to LlamaParse", quality, TEXT_QUALITY_THRESHOLD)
+        llama_result = await self._try_llama_cloud(path, filename)
+        if llama_result:
+            return llama_result
+        return await self._parse_with_ai(text)
+
+    def _report(self, stage: str):
+        if self.on_progress:
+            self.on_progress(stage)
+
+    def _cache_key(self, digest: str, filename: str) -> str:
+        """Key parsed results by file content hash, file type and parser/model version"""
+        extension = os.path.splitext(filename)[1].lower()
+        return f"{digest}:{extension}:{RESUME_PARSER_VERSION}:{self.MODEL}"
     
     async def _parse_with_ai(self, text: str) -> dict:
-        """Parse resume text using OpenRouter LLM"""
+        """Parse resume text with local rules, asking the OpenRouter LLM for fields they miss or only guess at"""
+        fields, confidence = score_fields(text)
+        # Low-confidence guesses (an unlabelled name or phone number) are asked for
+        # again; the guess is kept only if the LLM has nothing better
+        missing = missing_fields(fields) + unsure_fields(confidence)
+        if self.required_fields is not None and not self.required_fields.intersection(missing):
+            # Everything the target form needs was found locally
+            self.partial = bool(missing)
+            log_resume_data(fields)
+            return fields
+        if not missing:
+            log_resume_data(fields)
+            return fields
+        
         if not self.llm:
             log_error("OpenRouter LLM not initialized", "resume-parser")
-            return self._get_fallback_data()
+            return self._get_fallback_data(fields)
         
+        template = ",\n".join(f'    "{key}": "{FIELD_DESCRIPTIONS[key]}"' for key in missing)
         prompt = f"""
 Extract and structure the following resume information into JSON format:
 
 {{
-    "Full Name": "extracted full name",
-    "Email": "extracted email address", 
-    "Phone Number": "extracted phone number",
-    "Address": "extracted address",
-    "Education": "education background",
-    "Work Experience": "work experience summary",
-    "Skills": "technical and professional skills"
+{template}
 }}
 
 Resume text:
@@ -91,7 +196,9 @@ Return only valid JSON, no additional text.
 """
         
         try:
-            response = await self.llm.acomplete(prompt)
+            self._report("llm_parse")
+            with span("resume.llm"):
+                response = await self.llm.acomplete(prompt)
             content = str(response).strip()
             
             # Clean and parse JSON response
@@ -100,24 +207,29 @@ Return only valid JSON, no additional text.
             # Handle empty response
             if not cleaned_content or cleaned_content.isspace():
                 log_error("Empty response from OpenRouter", "resume-parser")
-                return self._get_fallback_data()
+                return self._get_fallback_data(fields)
             
             parsed = json.loads(cleaned_content)
             
+            # Confident local fields win; the LLM fills the gaps and replaces guesses
+            if isinstance(parsed, dict):
+                parsed = {**fields, **{key: parsed[key] for key in missing if key in parsed and (parsed[key] or key not in fields)}}
+            
             # Validate required fields
             if self._validate_parsed_data(parsed):
                 log_resume_data(parsed)
                 return parsed
             else:
                 log_error("Invalid data structure from OpenRouter", "resume-parser")
-                return self._get_fallback_data()
+                return self._get_fallback_data(fields)
                 
         except Exception as e:
             log_error(f"OpenRouter parsing failed: {e}", "resume-parser")
-            return self._get_fallback_data()
+            return self._get_fallback_data(fields)
     
-    def _get_fallback_data(self) -> dict:
-        """Return fallback data when AI parsing fails"""
+    def _get_fallback_data(self, found: dict = None) -> dict:
+        """Return fallback data when AI parsing fails, keeping any locally extracted fields"""
+        self.used_fallback = True
         fallback_data = {
             "Full Name": "John Doe", 
             "Email": "john.doe@example.com", 
@@ -127,27 +239,20 @@ Return only valid JSON, no additional text.
             "Work Experience": "Senior Software Developer at Google with 5+ years experience in full-stack development",
             "Skills": "Python, JavaScript, React, Node.js, AWS, Docker, Kubernetes"
         }
+        fallback_data.update(found or {})
         log_resume_data(fallback_data)
         return fallback_data
     
-    async def _try_llama_cloud(self, content: bytes, filename: str) -> dict:
+    async def _try_llama_cloud(self, path: str, filename: str) -> dict:
         """Try LlamaParse for document parsing"""
         if not self.parser:
             log_error("LlamaParse not initialized", "resume-parser")
             return None
         
         try:
-            # Save content to temporary file for LlamaParse
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix=f".{filename.split('.')[-1]}", delete=False) as tmp_file:
-                tmp_file.write(content)
-                tmp_file_path = tmp_file.name
-            
-            # Parse document with LlamaParse
-            documents = await self.parser.aload_data(tmp_file_path)
-            
-            # Clean up temporary file
-            os.unlink(tmp_file_path)
+            # LlamaParse reads the stored upload directly; no extra temp copy
+            with span("resume.llamaparse"):
+                documents = await self.parser.aload_data(path)
             
             if documents:
                 # Extract text from parsed documents
@@ -175,18 +280,6 @@ Return only valid JSON, no additional text.
         else:
             return 'text/plain'
     
-    def _extract_field(self, text: str, keywords: list) -> str:
-        """Simple field extraction from text"""
-        lines = text.lower().split('\n')
-        for line in lines:
-            for keyword in keywords:
-                if keyword in line:
-                    # Extract content after the keyword
-                    parts = line.split(keyword)
-                    if len(parts) > 1:
-                        return parts[1].strip(' :').strip()
-        return ''
-    
     def _clean_json_response(self, content: str) -> str:
         """Clean JSON response from AI models"""
         # Remove markdown code blocks
@@ -0,0 +1,193 @@
+import re
+
+# Keys _parse_with_ai asks the LLM for, in prompt order
+RESUME_FIELDS = ("Full Name", "Email", "Phone Number", "Address", "Education", "Work Experience", "Skills")
+
+EMAIL_PATTERN = re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}\b", re.IGNORECASE)
+# +44 20 7946 0958, (555) 123-4567, 555.123.4567, +91-98765-43210
+PHONE_PATTERN = re.compile(r"(?<![\w+])(?:\+\d{1,3}[\s.-]?)?(?:\(\d{1,4}\)[\s.-]?)?\d{2,5}(?:[\s.-]?\d{2,5}){1,4}(?!\w)")
+# 555-123-4567, 98765 43210, 020 7946 0958
+PHONE_FORMAT_PATTERN = re.compile(r"^(?:\d{3}[\s.-]\d{3}[\s.-]\d{4}|\d{5}[\s.-]\d{5}|0\d{2,4}[\s.-]\d{3,4}[\s.-]\d{3,4})$")
+# Words before a number on its line that say whether it is a phone number
+PHONE_CONTEXT_PATTERN = re.compile(r"\b(?:phone|mobile|mob|tel|telephone|cell|ph|contact|whatsapp)\b")
+NOT_PHONE_CONTEXT_PATTERN = re.compile(r"\b(?:order|invoice|account|acct|id|ref|reference|no|number|isbn|ssn|passport|licen[cs]e|policy|serial|gpa)\b|#")
+YEAR_RANGE_PATTERN = re.compile(r"^(?:19|20)\d{2}\s*[-.]\s*(?:19|20)\d{2}$")
+DATE_PATTERN = re.compile(r"^\d{4}[.-]\d{1,2}[.-]\d{1,2}$|^\d{1,2}[.-]\d{1,2}[.-]\d{4}$")
+LINKEDIN_PATTERN = re.compile(r"(?:https?://)?(?:[\w-]+\.)?linkedin\.com/(?:in|pub)/[\w%-]+/?", re.IGNORECASE)
+GITHUB_PATTERN = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[\w-]+/?", re.IGNORECASE)
+URL_PATTERN = re.compile(r"(?:https?://|www\.)[^\s|,;<>()]+", re.IGNORECASE)
+NAME_LINE_PATTERN = re.compile(r"^[A-Z][A-Za-z'.-]*(?:\s+[A-Z][A-Za-z'.-]*){1,3}$")
+LABELLED_LINE_PATTERN = re.compile(r"^\s*(name|full name|address|location|phone|mobile|email)\s*[:\-]\s*(.+)$", re.IGNORECASE)
+HEADING_LINE_PATTERN = re.compile(r"^\s*([A-Za-z][A-Za-z &/]{2,40}?)\s*:?\s*$")
+
+# Section headings and the resume key their body fills; other known headings just end a section
+SECTION_KEYS = {
+    "education": "Education",
+    "academic background": "Education",
+    "experience": "Work Experience",
+    "work experience": "Work Experience",
+    "professional experience": "Work Experience",
+    "employment": "Work Experience",
+    "employment history": "Work Experience",
+    "work history": "Work Experience",
+    "skills": "Skills",
+    "technical skills": "Skills",
+    "certifications": "Certifications",
+    "certification": "Certifications",
+    "licenses": "Certifications",
+}
+OTHER_HEADINGS = {
+    "summary", "profile", "objective", "projects", "awards", "publications", "languages",
+    "interests", "references", "contact", "contact information", "volunteering",
+}
+LABEL_KEYS = {
+    "name": "Full Name", "full name": "Full Name", "address": "Address", "location": "Address",
+    "phone": "Phone Number", "mobile": "Phone Number", "email": "Email",
+}
+NOT_NAMES = {"curriculum vitae", "resume", "cv"}
+# Words that make a Title Case line a job title rather than a name
+ROLE_WORDS = {
+    "engineer", "developer", "programmer", "manager", "analyst", "designer", "consultant",
+    "scientist", "architect", "administrator", "specialist", "director", "officer", "intern",
+    "assistant", "associate", "coordinator", "executive", "technician", "accountant", "lead",
+    "senior", "junior", "principal", "head", "student", "teacher", "nurse", "software",
+    "data", "marketing", "sales", "product", "project",
+}
+SECTION_MAX_CHARS = 1000
+# Rule-found values scoring below this are checked with the LLM when it is available
+RULE_MIN_CONFIDENCE = 0.8
+
+
+def _phone_confidence(candidate: str, before: str) -> float:
+    """How likely a digit run is a phone number, from the words before it on its line and its format"""
+    digits = sum(ch.isdigit() for ch in candidate)
+    if not 7 <= digits <= 15:
+        return 0.0
+    if YEAR_RANGE_PATTERN.match(candidate) or DATE_PATTERN.match(candidate):
+        return 0.0
+    if PHONE_CONTEXT_PATTERN.search(before):
+        return 1.0
+    if NOT_PHONE_CONTEXT_PATTERN.search(before):
+        return 0.0
+    # A bare run of digits is more likely an ID than a phone number
+    if candidate.isdigit():
+        return 0.5 if digits >= 10 else 0.0
+    if candidate.startswith(("+", "(")) or PHONE_FORMAT_PATTERN.match(candidate):
+        return 0.9
+    return 0.5
+
+
+def _find_phone(lines: list) -> tuple:
+    """Most phone-like number in the text and its confidence, ("", 0.0) when there is none"""
+    best, best_confidence = "", 0.0
+    for line in lines:
+        for match in PHONE_PATTERN.finditer(line):
+            candidate = match.group().strip()
+            confidence = _phone_confidence(candidate, line[:match.start()].lower())
+            if confidence > best_confidence:
+                best, best_confidence = candidate, confidence
+    return best, best_confidence
+
+
+def _find_name(lines: list) -> tuple:
+    """First name-like line near the top and its confidence, ("", 0.0) when there is none"""
+    for index, line in enumerate(lines[:5]):
+        if len(line) > 40 or line.lower() in NOT_NAMES or _heading_key(line) is not None:
+            continue
+        if not NAME_LINE_PATTERN.match(line):
+            continue
+        # "Software Engineer" is a job title, not a name
+        if ROLE_WORDS.intersection(word.lower().strip(".") for word in line.split()):
+            continue
+        return line, 0.9 if index == 0 else 0.6
+    return "", 0.0
+
+
+def _heading_key(line: str):
+    """Resume key for a section heading line, "" for a heading with no key, None for body text"""
+    match = HEADING_LINE_PATTERN.match(line)
+    if not match:
+        return None
+    heading = " ".join(match.group(1).lower().split())
+    if heading in SECTION_KEYS:
+        return SECTION_KEYS[heading]
+    return "" if heading in OTHER_HEADINGS else None
+
+
+def split_sections(lines: list) -> dict:
+    """Body text under Education / Experience / Skills / Certifications headings"""
+    sections = {}
+    current = None
+    for line in lines:
+        key = _heading_key(line)
+        if key is not None:
+            current = key or None
+            continue
+        if current:
+            sections.setdefault(current, []).append(line)
+    return {
+        key: " ".join(" ".join(body).split())[:SECTION_MAX_CHARS]
+        for key, body in sections.items() if body
+    }
+
+
+def score_fields(text: str) -> tuple:
+    """Resume fields that can be read off the text without an LLM, in the _parse_with_ai shape,
+    and a 0-1 confidence for each.
+
+    Only keys that were found are present; LinkedIn, GitHub and Website are
+    added when the resume links to them. Everything but an unlabelled name or
+    phone number comes from an unambiguous pattern and scores 1.0.
+    """
+    lines = [line.strip() for line in (text or "").splitlines() if line.strip()]
+    fields = {}
+
+    for line in lines[:30]:
+        match = LABELLED_LINE_PATTERN.match(line)
+        if match:
+            fields.setdefault(LABEL_KEYS[match.group(1).lower()], match.group(2).strip())
+    confidence = dict.fromkeys(fields, 1.0)
+
+    email = EMAIL_PATTERN.search(text or "")
+    if email:
+        fields["Email"] = email.group()
+        confidence["Email"] = 1.0
+    phone, phone_confidence = _find_phone(lines)
+    if phone and phone_confidence >= confidence.get("Phone Number", 0.0):
+        fields["Phone Number"] = phone
+        confidence["Phone Number"] = phone_confidence
+    if "Full Name" not in fields:
+        name, name_confidence = _find_name(lines)
+        if name:
+            fields["Full Name"] = name
+            confidence["Full Name"] = name_confidence
+
+    linkedin = LINKEDIN_PATTERN.search(text or "")
+    if linkedin:
+        fields["LinkedIn"] = linkedin.group()
+    github = GITHUB_PATTERN.search(text or "")
+    if github:
+        fields["GitHub"] = github.group()
+    for url in URL_PATTERN.findall(text or ""):
+        if "linkedin.com" not in url.lower() and "github.com" not in url.lower():
+            fields["Website"] = url.rstrip(".")
+            break
+
+    for key, body in split_sections(lines).items():
+        fields.setdefault(key, body)
+    for key in fields:
+        confidence.setdefault(key, 1.0)
+    return fields, confidence
+
+
+def extract_fields(text: str) -> dict:
+    return score_fields(text)[0]
+
+
+def missing_fields(fields: dict) -> list:
+    return [key for key in RESUME_FIELDS if not fields.get(key)]
+
+
+def unsure_fields(confidence: dict) -> list:
+    """Keys found by rules too weak to trust over the LLM"""
+    return [key for key in RESUME_FIELDS if key in confidence and confidence[key] < RULE_MIN_CONFIDENCE]
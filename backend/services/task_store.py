@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from services.cache import connect_sqlite, SQLiteWriter, EVICT_INTERVAL
+from config import TASK_STORE, TASK_STORE_PATH, TASK_STORE_MAX_TASKS, TASK_STORE_TTL
+
+FINISHED_STATUSES = ("completed", "error")
+
+
+class TaskStore(ABC):
+    """Interface for task/batch status storage"""
+
+    @abstractmethod
+    def get(self, task_id: str):
+        ...
+
+    @abstractmethod
+    def set(self, task_id: str, state: dict):
+        ...
+
+    @abstractmethod
+    def delete(self, task_id: str):
+        ...
+
+    def flush(self):
+        """Wait for buffered writes, if the store has any"""
+
+
+class InMemoryTaskStore(TaskStore):
+    """Per-process store holding at most max_tasks, dropping finished tasks after ttl seconds"""
+
+    def __init__(self, max_tasks: int = 10000, ttl: float = 3600):
+        self.max_tasks = max_tasks
+        self.ttl = ttl
+        self._tasks = OrderedDict()
+        self._lock = threading.Lock()
+        self._evicted_at = time.time()
+
+    def get(self, task_id: str):
+        with self._lock:
+            item = self._tasks.get(task_id)
+            return item[0] if item else None
+
+    def set(self, task_id: str, state: dict):
+        now = time.time()
+        with self._lock:
+            self._tasks.pop(task_id, None)
+            self._tasks[task_id] = (state, now)
+            # Scanning every task is only worth it now and then, or once the store is full
+            if len(self._tasks) > self.max_tasks or now - self._evicted_at >= EVICT_INTERVAL:
+                self._evict(now)
+                self._evicted_at = now
+
+    def delete(self, task_id: str):
+        with self._lock:
+            self._tasks.pop(task_id, None)
+
+    def _evict(self, now: float):
+        expired = [
+            task_id for task_id, (state, updated_at) in self._tasks.items()
+            if state.get("status") in FINISHED_STATUSES and now - updated_at > self.ttl
+        ]
+        for task_id in expired:
+            del self._tasks[task_id]
+
+        # Over capacity: drop the least recently updated tasks, finished ones first, down to
+        # 90% of max_tasks so a full store is not rescanned on every set
+        if len(self._tasks) > self.max_tasks:
+            overflow = len(self._tasks) - int(self.max_tasks * 0.9)
+            finished = [
+                task_id for task_id, (state, _) in self._tasks.items()
+                if state.get("status") in FINISHED_STATUSES
+            ]
+            for task_id in finished[:overflow]:
+                del self._tasks[task_id]
+            while len(self._tasks) > self.max_tasks:
+                self._tasks.popitem(last=False)
+
+    def __len__(self):
+        return len(self._tasks)
+
+
+class SQLiteTaskStore(TaskStore):
+    """Store shared by every worker process on the host through one SQLite file.
+
+    Writes are committed in order on a background thread; until then, reads
+    in this process are answered from the pending state.
+    """
+
+    def __init__(self, path: str, max_tasks: int = 10000, ttl: float = 3600):
+        self.path = path
+        self.max_tasks = max_tasks
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # Serialized states submitted to the writer and not yet committed
+        self._pending = {}
+        self._evicted_at = 0.0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = connect_sqlite(path)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "task_id TEXT PRIMARY KEY, state TEXT NOT NULL, "
+                "finished INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_updated_at ON tasks (updated_at)")
+        self._writer = SQLiteWriter(path, "task-store")
+
+    def get(self, task_id: str):
+        with self._lock:
+            data = self._pending.get(task_id)
+            if data is None:
+                row = self._conn.execute("SELECT state FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+                data = row[0] if row else None
+        return json.loads(data) if data is not None else None
+
+    def set(self, task_id: str, state: dict):
+        # Serialize now: callers keep mutating batch states in place
+        data = json.dumps(state)
+        finished = 1 if state.get("status") in FINISHED_STATUSES else 0
+        with self._lock:
+            self._pending[task_id] = data
+        self._writer.submit(self._write, task_id, data, finished, time.time())
+
+    def _write(self, conn, task_id: str, data: str, finished: int, now: float):
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO tasks (task_id, state, finished, updated_at) VALUES (?, ?, ?, ?)",
+                (task_id, data, finished, now)
+            )
+            if now - self._evicted_at >= EVICT_INTERVAL:
+                self._evict(conn, now)
+                self._evicted_at = now
+        with self._lock:
+            if self._pending.get(task_id) is data:
+                del self._pending[task_id]
+
+    def delete(self, task_id: str):
+        with self._lock:
+            self._pending.pop(task_id, None)
+        self._writer.submit(self._delete, task_id)
+
+    def _delete(self, conn, task_id: str):
+        with conn:
+            conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+
+    def _evict(self, conn, now: float):
+        conn.execute("DELETE FROM tasks WHERE finished = 1 AND updated_at < ?", (now - self.ttl,))
+        count = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        overflow = count - self.max_tasks
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM tasks WHERE task_id IN "
+                "(SELECT task_id FROM tasks WHERE finished = 1 ORDER BY updated_at ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def flush(self):
+        """Wait until every state set so far is committed and visible to other processes"""
+        self._writer.flush()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+
+_task_store = None
+
+def get_task_store() -> TaskStore:
+    """Configured task store (TASK_STORE=memory|sqlite), created on first use"""
+    global _task_store
+    if _task_store is None:
+        if TASK_STORE == "sqlite":
+            _task_store = SQLiteTaskStore(TASK_STORE_PATH, TASK_STORE_MAX_TASKS, TASK_STORE_TTL)
+        else:
+            _task_store = InMemoryTaskStore(TASK_STORE_MAX_TASKS, TASK_STORE_TTL)
+    return _task_store
@@ -0,0 +1,217 @@
+import os
+import re
+from abc import ABC, abstractmethod
+from concurrent.futures.process import BrokenProcessPool
+from logger import log_error
+from services.executor import get_process_pool, discard_process_pool
+from services.registry import load
+from config import EXTRACT_PROCESSES, EXTRACT_PARALLEL_MIN_PAGES, EXTRACT_MAX_CHARS, EXTRACT_MAX_PAGES
+
+
+# Resume section headings, one per line ("Work Experience", "SKILLS:")
+SECTION_HEADING_PATTERN = re.compile(
+    r"^\s*(summary|profile|objective|education|academic background|(?:work |professional )?experience|"
+    r"employment(?: history)?|work history|skills|technical skills|projects|certifications?|"
+    r"licenses|awards|publications|languages|interests|contact(?: information)?)\s*:?\s*$",
+    re.IGNORECASE | re.MULTILINE
+)
+WORD_PATTERN = re.compile(r"[A-Za-z]{2,}")
+# Characters a broken text layer produces: replacement chars, private use glyphs, controls
+GARBAGE_PATTERN = re.compile(r"[\ufffd\ue000-\uf8ff\x00-\x08\x0b\x0c\x0e-\x1f]|\(cid:\d+\)")
+QUALITY_MIN_CHARS = 400
+
+
+def score_text_quality(text: str) -> float:
+    """0-1 score of an extracted text layer: enough text, little garbage, real words, known sections.
+
+    Scanned PDFs yield little or no text; broken font maps yield (cid:N) runs
+    and replacement characters. Both should score well below 0.5.
+    """
+    stripped = (text or "").strip()
+    if not stripped:
+        return 0.0
+
+    length_score = min(len(stripped) / QUALITY_MIN_CHARS, 1.0)
+    garbage_chars = sum(len(match) for match in GARBAGE_PATTERN.findall(stripped))
+    garbage_score = max(0.0, 1.0 - 5 * garbage_chars / len(stripped))
+    word_chars = sum(len(word) for word in WORD_PATTERN.findall(stripped))
+    word_score = min(word_chars / len(stripped) / 0.6, 1.0)
+    section_score = min(len(SECTION_HEADING_PATTERN.findall(stripped)) / 2, 1.0)
+
+    score = 0.35 * length_score + 0.3 * garbage_score + 0.2 * word_score + 0.15 * section_score
+    # A mostly-garbage layer is unusable however long it is
+    return round(min(score, garbage_score), 3)
+
+
+class TextCollector:
+    """Accumulates text pieces and reports when the character budget is spent"""
+
+    def __init__(self, max_chars: int = 0):
+        self.max_chars = max_chars
+        self.parts = []
+        self.length = 0
+
+    def add(self, text: str) -> bool:
+        """Append text; returns True once max_chars is reached"""
+        text = (text or "").strip()
+        if text:
+            self.parts.append(text)
+            self.length += len(text) + 1
+        return self.full()
+
+    def full(self) -> bool:
+        return bool(self.max_chars) and self.length >= self.max_chars
+
+    def text(self) -> str:
+        return "\n".join(self.parts)
+
+
+class TextExtractor(ABC):
+    """Interface for a local extractor of one file type"""
+
+    @abstractmethod
+    def extract(self, path: str, max_chars: int = 0, max_pages: int = 0) -> str:
+        ...
+
+
+class PlainTextExtractor(TextExtractor):
+    def extract(self, path: str, max_chars: int = 0, max_pages: int = 0) -> str:
+        with open(path, encoding="utf-8") as f:
+            return f.read(max_chars) if max_chars else f.read()
+
+
+def _extract_pdf_pages(path: str, start: int, stop: int) -> list:
+    """Text of pages [start, stop); runs in a worker process"""
+    reader = load("pdf_reader")(path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+class PdfExtractor(TextExtractor):
+    """Page-by-page PDF text. Long documents read in full on a multi-core host
+    are split into one page range per process in the shared process pool;
+    capped reads stay serial so they stop at the character budget."""
+
+    def __init__(self, processes: int = EXTRACT_PROCESSES, parallel_min_pages: int = EXTRACT_PARALLEL_MIN_PAGES):
+        self.processes = processes
+        self.parallel_min_pages = parallel_min_pages
+
+    def extract(self, path: str, max_chars: int = 0, max_pages: int = 0) -> str:
+        reader = load("pdf_reader")(path)
+        page_count = len(reader.pages)
+        if max_pages:
+            page_count = min(page_count, max_pages)
+
+        if self._use_parallel(page_count, max_chars):
+            collector = TextCollector(max_chars)
+            if self._extract_parallel(path, page_count, collector):
+                return collector.text()
+        collector = TextCollector(max_chars)
+        for i in range(page_count):
+            if collector.add(reader.pages[i].extract_text()):
+                break
+        return collector.text()
+
+    def _use_parallel(self, page_count: int, max_chars: int) -> bool:
+        # Every range re-parses the whole file in its child process, so splitting only
+        # pays off with spare cores and every page wanted; a capped read usually
+        # fills its budget within the first few pages
+        return (
+            not max_chars
+            and self.processes > 1
+            and (os.cpu_count() or 1) > 1
+            and page_count >= self.parallel_min_pages
+        )
+
+    def _extract_parallel(self, path: str, page_count: int, collector: TextCollector) -> bool:
+        """Collect every page through the process pool; False if the pool broke, to retry serially"""
+        chunk = -(-page_count // self.processes)
+        pool = get_process_pool()
+        futures = []
+        try:
+            for start in range(0, page_count, chunk):
+                futures.append(pool.submit(_extract_pdf_pages, path, start, min(start + chunk, page_count)))
+            for future in futures:
+                for page_text in future.result():
+                    if collector.add(page_text):
+                        return True
+        except BrokenProcessPool as e:
+            # A child died (OOM, crash); drop the pool so the next call starts a fresh one
+            discard_process_pool(pool)
+            log_error(f"PDF extraction process pool broke: {e}", "text-extraction")
+            return False
+        finally:
+            for future in futures:
+                future.cancel()
+        return True
+
+
+class DocxExtractor(TextExtractor):
+    """Headers, then body paragraphs and tables in document order, then text boxes"""
+
+    def extract(self, path: str, max_chars: int = 0, max_pages: int = 0) -> str:
+        # python-docx is only imported once a .docx is parsed
+        from docx.oxml.ns import qn
+        from docx.table import Table
+        from docx.text.paragraph import Paragraph
+
+        doc = load("docx_document")(path)
+        collector = TextCollector(max_chars)
+
+        for section in doc.sections:
+            for part in (section.header, section.first_page_header):
+                if part.is_linked_to_previous:
+                    continue
+                for paragraph in part.paragraphs:
+                    collector.add(paragraph.text)
+
+        body = doc.element.body
+        for child in body.iterchildren():
+            if collector.full():
+                return collector.text()
+            if child.tag == qn("w:p"):
+                collector.add(Paragraph(child, doc).text)
+            elif child.tag == qn("w:tbl"):
+                self._add_table(Table(child, doc), collector)
+
+        # Text boxes appear twice (DrawingML and its VML fallback); keep one copy
+        boxes = dict.fromkeys(
+            "".join(node.text or "" for node in box.iter(qn("w:t")))
+            for box in body.iter(qn("w:txbxContent"))
+        )
+        for box_text in boxes:
+            if collector.add(box_text):
+                break
+        return collector.text()
+
+    def _add_table(self, table, collector: TextCollector):
+        # A merged cell is the same <w:tc> at every grid position it spans, across a
+        # row and down a vertical merge; distinct cells with equal text are all kept
+        seen = set()
+        for row in table.rows:
+            texts = []
+            for cell in row.cells:
+                if cell._tc in seen:
+                    continue
+                seen.add(cell._tc)
+                text = cell.text.strip()
+                if text:
+                    texts.append(text)
+            if collector.add(" | ".join(texts)):
+                return
+
+
+EXTRACTORS = {
+    ".pdf": PdfExtractor(),
+    ".docx": DocxExtractor(),
+    ".txt": PlainTextExtractor(),
+}
+
+def register_extractor(extension: str, extractor: TextExtractor):
+    """Plug in (or replace) the local extractor for a file extension"""
+    EXTRACTORS[extension.lower()] = extractor
+
+def extract_text(path: str, filename: str, max_chars: int = EXTRACT_MAX_CHARS, max_pages: int = EXTRACT_MAX_PAGES) -> str:
+    """Local text of a stored document, stopping early once max_chars are collected"""
+    extension = os.path.splitext(filename)[1].lower()
+    extractor = EXTRACTORS.get(extension, EXTRACTORS[".txt"])
+    return extractor.extract(path, max_chars, max_pages)
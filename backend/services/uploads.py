@@ -0,0 +1,79 @@
+import os
+import hashlib
+import tempfile
+from config import UPLOAD_MAX_BYTES, UPLOAD_CHUNK_SIZE, UPLOAD_TMP_DIR
+
+
+class UploadTooLarge(Exception):
+    """The upload exceeds UPLOAD_MAX_BYTES"""
+
+
+class StoredUpload:
+    """An upload written to a named temp file, with its size and SHA-256.
+
+    Parsers read it by path, so the file is never held in memory whole.
+    Use as a context manager (or call cleanup) to delete the file.
+    """
+
+    def __init__(self, path: str, filename: str, size: int, sha256: str):
+        self.path = path
+        self.filename = filename
+        self.size = size
+        self.sha256 = sha256
+
+    def read_bytes(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def cleanup(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cleanup()
+
+
+def _new_temp_file(filename: str):
+    suffix = os.path.splitext(filename or "")[1].lower()
+    if UPLOAD_TMP_DIR:
+        os.makedirs(UPLOAD_TMP_DIR, exist_ok=True)
+    return tempfile.NamedTemporaryFile(prefix="upload_", suffix=suffix, dir=UPLOAD_TMP_DIR, delete=False)
+
+
+async def save_upload(file, max_bytes: int = UPLOAD_MAX_BYTES) -> StoredUpload:
+    """Stream an UploadFile to disk chunk by chunk, hashing as it goes"""
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge(f"{file.filename} is larger than {max_bytes} bytes")
+
+    digest = hashlib.sha256()
+    size = 0
+    tmp = _new_temp_file(file.filename)
+    try:
+        with tmp:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"{file.filename} is larger than {max_bytes} bytes")
+                digest.update(chunk)
+                tmp.write(chunk)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+    finally:
+        await file.close()
+    return StoredUpload(tmp.name, file.filename, size, digest.hexdigest())
+
+
+def store_bytes(content: bytes, filename: str) -> StoredUpload:
+    """StoredUpload for content that is already in memory"""
+    with _new_temp_file(filename) as tmp:
+        tmp.write(content)
+    return StoredUpload(tmp.name, filename, len(content), hashlib.sha256(content).hexdigest())
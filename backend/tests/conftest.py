@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Tests import the app modules the way main.py does, from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LOG_FILE", "")
+os.environ.setdefault("CACHE_DIR", "")
@@ -0,0 +1,56 @@
+import pytest
+from services.field_matcher import FieldMatcher, is_typo_of
+
+matcher = FieldMatcher()
+
+
+@pytest.mark.parametrize("label, resume_key", [
+    ("Work email", "Email"),
+    ("Email (work)", "Email"),
+    ("Contact email", "Email"),
+    ("Your contact email", "Email"),
+    ("Work phone", "Phone Number"),
+    ("Contact number", "Phone Number"),
+    ("Full name", "Full Name"),
+    ("Work experience", "Work Experience"),
+])
+def test_specific_synonym_beats_generic(label, resume_key):
+    key, confidence = matcher.match(label)
+    assert key == resume_key
+    assert matcher.is_confident(confidence)
+
+
+def test_near_tie_is_not_confident():
+    _, confidence = matcher.match("Name and email")
+    assert not matcher.is_confident(confidence)
+    assert not matcher.is_plausible(confidence)
+
+
+@pytest.mark.parametrize("label", [
+    "Same", "Main", "Tell us", "Tell us more", "Main reason for leaving",
+    "Still employed?", "Contract type", "Lumber", "There",
+])
+def test_everyday_words_do_not_fuzzy_match(label):
+    assert matcher.match(label) == (None, 0.0)
+
+
+@pytest.mark.parametrize("label, resume_key", [
+    ("Emial address", "Email"),
+    ("Phnoe", "Phone Number"),
+    ("Adress", "Address"),
+])
+def test_typos_still_match(label, resume_key):
+    assert matcher.match(label)[0] == resume_key
+
+
+def test_typo_rules():
+    assert is_typo_of("emial", "email")
+    assert not is_typo_of("still", "skill")
+    assert not is_typo_of("contract", "contact")
+    assert is_typo_of("adress", "address")
+
+
+def test_choice_questions_are_not_confident():
+    assert matcher.match("Years of experience", 2) == (None, 0.0)
+    _, confidence = matcher.match("Highest qualification", 3)
+    assert not matcher.is_confident(confidence)
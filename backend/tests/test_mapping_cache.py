@@ -0,0 +1,43 @@
+import pytest
+from services.cache import build_cache
+from services.mapping_cache import EXPORT_VERSION, FieldMappingCache
+
+
+def new_cache() -> FieldMappingCache:
+    return FieldMappingCache(build_cache("test_field_mappings", 100, 0, 3600))
+
+
+def test_import_round_trips_export():
+    source = new_cache()
+    source.set("Your email", "email", "Email", 0.9)
+    source.set("Favourite colour", "text", None, 0.0)
+    target = new_cache()
+    assert target.import_entries(source.export()) == {"imported": 2, "skipped": 0}
+    assert target.get("Your email", "email") == ("Email", 0.9)
+    assert target.get("Favourite colour", "text") == (None, 0.0)
+
+
+@pytest.mark.parametrize("entry", [
+    {"label": "Salary", "field_type": "text", "resume_key": "Bank Account", "confidence": 0.9},
+    {"label": "Email", "field_type": "text", "resume_key": "Email", "confidence": 1.5},
+    {"label": "Email", "field_type": "text", "resume_key": "Email", "confidence": -0.1},
+    {"label": "Email", "field_type": "text", "resume_key": "Email", "confidence": "0.9"},
+    {"label": "Email", "field_type": "text", "resume_key": "Email", "confidence": True},
+    {"label": "Email", "field_type": "text", "resume_key": "Email", "confidence": float("nan")},
+    {"label": "", "field_type": "text", "resume_key": "Email", "confidence": 0.9},
+    {"label": None, "field_type": "text", "resume_key": "Email", "confidence": 0.9},
+    {"label": "Email", "field_type": ["text"], "resume_key": "Email", "confidence": 0.9},
+    "Email",
+])
+def test_import_skips_invalid_entries(entry):
+    cache = new_cache()
+    valid = {"label": "Phone", "field_type": "tel", "resume_key": "Phone Number", "confidence": 0.8}
+    counts = cache.import_entries({"version": EXPORT_VERSION, "entries": [entry, valid]})
+    assert counts == {"imported": 1, "skipped": 1}
+    assert cache.get("Email", "text") is None
+    assert cache.get("Phone", "tel") == ("Phone Number", 0.8)
+
+
+def test_import_rejects_unknown_version():
+    with pytest.raises(ValueError):
+        new_cache().import_entries({"version": EXPORT_VERSION + 1, "entries": []})
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from services.resume_parser import ResumeParser
+from services.resume_rules import RULE_MIN_CONFIDENCE, score_fields, unsure_fields
+
+
+def test_job_title_is_not_a_name():
+    fields, _ = score_fields("Software Engineer\njane@example.com\n")
+    assert "Full Name" not in fields
+
+
+def test_name_after_job_title():
+    fields, confidence = score_fields("Senior Data Analyst\nJane Roe\njane@example.com\n")
+    assert fields["Full Name"] == "Jane Roe"
+    assert confidence["Full Name"] < RULE_MIN_CONFIDENCE
+
+
+def test_name_on_first_line_is_confident():
+    fields, confidence = score_fields("Jane Roe\njane@example.com\n")
+    assert fields["Full Name"] == "Jane Roe"
+    assert "Full Name" not in unsure_fields(confidence)
+
+
+def test_order_number_is_not_a_phone():
+    fields, _ = score_fields("Jane Roe\nOrder no 4567 8901 2345\n")
+    assert "Phone Number" not in fields
+
+
+def test_unformatted_digit_groups_are_unsure():
+    fields, confidence = score_fields("Jane Roe\n4567 8901 2345\n")
+    assert fields["Phone Number"] == "4567 8901 2345"
+    assert unsure_fields(confidence) == ["Phone Number"]
+
+
+def test_phone_context_beats_earlier_number():
+    text = "Jane Roe\nRef 4567 8901 2345\nMobile: +44 20 7946 0958\n"
+    fields, confidence = score_fields(text)
+    assert fields["Phone Number"] == "+44 20 7946 0958"
+    assert confidence["Phone Number"] == 1.0
+
+
+@pytest.mark.parametrize("line, phone", [
+    ("(555) 123-4567", "(555) 123-4567"),
+    ("jane@example.com | 555.123.4567", "555.123.4567"),
+    ("+91-98765-43210", "+91-98765-43210"),
+])
+def test_formatted_phone_is_confident(line, phone):
+    fields, confidence = score_fields(f"Jane Roe\n{line}\n")
+    assert fields["Phone Number"] == phone
+    assert confidence["Phone Number"] >= RULE_MIN_CONFIDENCE
+
+
+class StubLLM:
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    async def acomplete(self, prompt):
+        self.prompts.append(prompt)
+        return self.reply
+
+
+def test_llm_replaces_low_confidence_guesses():
+    parser = ResumeParser()
+    parser.llm = StubLLM('{"Full Name": "Jane A. Roe", "Phone Number": "+1 555 010 9999", "Address": "", '
+                         '"Education": "", "Work Experience": "", "Skills": ""}')
+    text = "Senior Data Analyst\nJane Roe\njane@example.com\n4567 8901 2345\n"
+    parsed = asyncio.run(parser._parse_with_ai(text))
+    assert '"Phone Number"' in parser.llm.prompts[0]
+    assert parsed["Full Name"] == "Jane A. Roe"
+    assert parsed["Phone Number"] == "+1 555 010 9999"
+    assert parsed["Email"] == "jane@example.com"
+
+
+def test_low_confidence_guess_kept_when_llm_has_none():
+    parser = ResumeParser()
+    parser.llm = StubLLM('{"Phone Number": ""}')
+    parsed = asyncio.run(parser._parse_with_ai("Jane Roe\njane@example.com\n4567 8901 2345\n"))
+    assert parsed["Phone Number"] == "4567 8901 2345"
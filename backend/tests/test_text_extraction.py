@@ -0,0 +1,50 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import docx
+from services import executor, text_extraction
+from services.text_extraction import DocxExtractor, PdfExtractor, TextCollector
+
+LONG_CV = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "corpus", "resumes", "long_cv.pdf")
+
+
+def test_table_keeps_equal_text_in_distinct_cells():
+    table = docx.Document().add_table(rows=3, cols=3)
+    table.cell(0, 0).merge(table.cell(0, 1)).text = "Span"
+    table.cell(1, 0).merge(table.cell(2, 0)).text = "Tall"
+    table.cell(0, 2).text = "Python"
+    table.cell(1, 1).text = "Yes"
+    table.cell(1, 2).text = "Yes"
+    collector = TextCollector()
+    DocxExtractor()._add_table(table, collector)
+    assert collector.text() == "Span | Python\nTall | Yes | Yes"
+
+
+def test_capped_read_stays_serial(monkeypatch):
+    monkeypatch.setattr(text_extraction.os, "cpu_count", lambda: 4)
+    extractor = PdfExtractor(processes=4, parallel_min_pages=2)
+    assert extractor._use_parallel(10, 0)
+    assert not extractor._use_parallel(10, 6000)
+    monkeypatch.setattr(text_extraction.os, "cpu_count", lambda: 1)
+    assert not extractor._use_parallel(10, 0)
+
+
+class BrokenPool:
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("child died")
+
+    def shutdown(self, **kwargs):
+        self.shut_down = True
+
+
+def test_broken_pool_is_discarded_and_read_falls_back(monkeypatch):
+    monkeypatch.setattr(text_extraction.os, "cpu_count", lambda: 2)
+    broken = BrokenPool()
+    monkeypatch.setattr(executor, "_process_pool", broken)
+    text = PdfExtractor(processes=2, parallel_min_pages=2).extract(LONG_CV)
+    assert text == PdfExtractor(processes=1).extract(LONG_CV)
+    assert broken.shut_down
+    assert executor._process_pool is None
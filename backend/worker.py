@@ -0,0 +1,144 @@
+"""Worker process for queued form-fill jobs (JOB_QUEUE=sqlite).
+
+Run as many as the host can take next to the API, on the same JOB_QUEUE_PATH,
+TASK_STORE_PATH and upload directory:
+
+    JOB_QUEUE=sqlite python worker.py
+
+Each process runs JOB_WORKER_CONCURRENCY jobs at once and finishes its
+current jobs before exiting on SIGINT/SIGTERM.
+"""
+import os
+import signal
+import socket
+import random
+import asyncio
+from dotenv import load_dotenv
+
+# Load .env before importing modules that read configuration at import time
+load_dotenv()
+
+from services.job_queue import get_job_queue, is_transient_error
+from services.form_jobs import FILL_FORM, run_fill_job, upload_from_payload
+from services.progress import update_task
+from services.task_store import get_task_store
+from services.metrics import collect_spans, spans_ms
+from services.http_client import close_http_client
+from services.executor import shutdown_executor
+from logger import logger, log_error
+from config import (
+    JOB_WORKER_CONCURRENCY,
+    JOB_MAX_ATTEMPTS,
+    JOB_RETRY_BASE_DELAY,
+    JOB_RETRY_MAX_DELAY,
+    JOB_LEASE_SECONDS,
+    JOB_POLL_INTERVAL,
+)
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, so retries of one outage do not land together"""
+    delay = min(JOB_RETRY_MAX_DELAY, JOB_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+async def keep_lease(queue, job_id: int, worker: str, job: asyncio.Task):
+    """Renew the lease while `job` runs, and stop it if another worker has taken the job over"""
+    while True:
+        await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+        if not await asyncio.to_thread(queue.renew, job_id, worker):
+            log_error(f"Lost the lease on job {job_id}, stopping it", "worker")
+            job.cancel()
+            return
+
+
+async def run_job(queue, job: dict, worker: str):
+    task_id = job["task_id"]
+    attempt = job["attempts"]
+    payload = job["payload"]
+    upload = upload_from_payload(payload)
+    lease = None
+
+    with collect_spans() as spans:
+        result = error = None
+        try:
+            if job["kind"] != FILL_FORM:
+                raise ValueError(f"Unknown job kind: {job['kind']}")
+            if attempt > JOB_MAX_ATTEMPTS:
+                # Claimed again after its workers died mid-run once too often
+                raise RuntimeError(f"Job abandoned after {attempt - 1} attempts")
+            update_task(task_id, {"status": "processing", "progress": 0, "attempt": attempt})
+            fill = asyncio.create_task(run_fill_job(task_id, payload["form_url"], upload))
+            lease = asyncio.create_task(keep_lease(queue, job["job_id"], worker, fill))
+            result = await fill
+            retryable = bool(result.get("retryable"))
+        except asyncio.CancelledError:
+            if lease is None or not lease.done() or lease.cancelled():
+                raise
+            # The job now belongs to another worker: leave its queue row, task and upload to that one
+            logger.info("Job %s stopped after its lease moved to another worker", job["job_id"])
+            return
+        except Exception as e:
+            error = e
+            retryable = is_transient_error(e)
+        finally:
+            if lease is not None:
+                lease.cancel()
+        timing = spans_ms(spans)
+
+    if retryable and attempt < JOB_MAX_ATTEMPTS:
+        reason = str(error) if error else result.get("error")
+        delay = retry_delay(attempt)
+        await asyncio.to_thread(queue.retry, job["job_id"], reason, delay)
+        update_task(task_id, {
+            "status": "queued", "progress": 0, "attempt": attempt,
+            "retry_in": round(delay, 1), "error": reason, "timing": timing
+        })
+        logger.info("Job %s attempt %s failed (%s), retrying in %.1fs", job["job_id"], attempt, reason, delay)
+        return
+
+    upload.cleanup()
+    if error is None:
+        await asyncio.to_thread(queue.complete, job["job_id"])
+        update_task(task_id, {"status": "completed", "progress": 100, "result": result, "timing": timing})
+    else:
+        log_error(f"Job {job['job_id']} failed: {error}", "worker")
+        await asyncio.to_thread(queue.fail, job["job_id"], str(error))
+        update_task(task_id, {"status": "error", "error": str(error), "timing": timing})
+
+
+async def work(queue, worker: str, stopping: asyncio.Event):
+    while not stopping.is_set():
+        job = await asyncio.to_thread(queue.claim, worker)
+        if job is None:
+            try:
+                await asyncio.wait_for(stopping.wait(), JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        await run_job(queue, job, worker)
+
+
+async def main():
+    queue = get_job_queue()
+    if queue is None:
+        raise SystemExit("JOB_QUEUE is not 'sqlite'; fill jobs run inside the web process")
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info("Worker %s started with %s slots on %s", name, JOB_WORKER_CONCURRENCY, queue.path)
+    try:
+        await asyncio.gather(*(work(queue, f"{name}:{slot}", stopping) for slot in range(JOB_WORKER_CONCURRENCY)))
+    finally:
+        await close_http_client()
+        shutdown_executor()
+        get_task_store().flush()
+    logger.info("Worker %s stopped", name)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,7 +3,7 @@ import { Container, Row, Col, Card, Button, Alert, Spinner } from 'react-bootstr
 import FileUpload from './components/FileUpload';
 import FormInput from './components/FormInput';
 import ResultDisplay from './components/ResultDisplay';
-import { fillForm, pollTaskStatus } from './services/api';
+import { fillForm, watchTaskStatus } from './services/api';
 
 function App() {
   const [file, setFile] = useState(null);
@@ -44,8 +44,8 @@ function App() {
       const response = await fillForm(file, formUrl);
       const { task_id } = response.data;
       
-      // Poll for results
-      const result = await pollTaskStatus(task_id, (prog, msg) => {
+      // Stream progress until the task finishes
+      const result = await watchTaskStatus(task_id, (prog, msg) => {
         setProgress(prog);
         setProgressMessage(msg || 'Processing...');
       });
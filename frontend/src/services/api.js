@@ -40,6 +40,23 @@ export const fillForm = async (file, formUrl) => {
   });
 };
 
+export const fillFormsBatch = async (files, formUrls) => {
+  const formData = new FormData();
+  files.forEach((file) => formData.append('files', file));
+  formUrls.forEach((formUrl) => formData.append('form_urls', formUrl));
+  
+  return api.post('/fill-forms/batch', formData, {
+    headers: {
+      'Content-Type': 'multipart/form-data',
+    },
+    timeout: 30000,
+  });
+};
+
+export const getBatchStatus = async (batchId) => {
+  return api.get(`/batch-status/${batchId}`);
+};
+
 export const getTaskStatus = async (taskId) => {
   return api.get(`/task-status/${taskId}`);
 };
@@ -68,6 +85,41 @@ export const pollTaskStatus = async (taskId, onProgress) => {
   });
 };
 
+export const watchTaskStatus = (taskId, onProgress) => {
+  if (typeof EventSource === 'undefined') {
+    return pollTaskStatus(taskId, onProgress);
+  }
+  
+  return new Promise((resolve, reject) => {
+    const source = new EventSource(`${API_BASE_URL}/task-events/${taskId}`);
+    let finished = false;
+    
+    source.addEventListener('progress', (event) => {
+      const { status, progress, result, error, message } = JSON.parse(event.data);
+      
+      if (onProgress && progress !== undefined) onProgress(progress, message);
+      
+      if (status === 'completed') {
+        finished = true;
+        source.close();
+        resolve(result);
+      } else if (status === 'error') {
+        finished = true;
+        source.close();
+        reject(new Error(error));
+      }
+    });
+    
+    // Stream unavailable (proxy, network): fall back to polling
+    source.onerror = () => {
+      source.close();
+      if (!finished) {
+        pollTaskStatus(taskId, onProgress).then(resolve, reject);
+      }
+    };
+  });
+};
+
 export const healthCheck = async () => {
   return api.get('/health');
 };
\ No newline at end of file